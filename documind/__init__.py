@@ -4,16 +4,22 @@ DocuMind - AI Document Intelligence Agent
 A multi-agent system for automated document analysis and insight extraction.
 """
 
+import importlib
+
 __version__ = "1.0.0"
 __author__ = "DocuMind Team"
 
-from .orchestrator import DocuMind
-from .agents.reader import ReaderAgent
-from .agents.extractor import ExtractorAgent
-from .agents.analyzer import AnalyzerAgent
-from .agents.qa_agent import QAAgent
-from .agents.memory import MemoryAgent
-from .agents.evaluator import EvaluatorAgent
+# Agents pull in transformers, spaCy, ChromaDB, etc., so they are imported
+# on first attribute access instead of at package import (PEP 562)
+_LAZY = {
+    "DocuMind": ("documind.orchestrator", "DocuMind"),
+    "ReaderAgent": ("documind.agents.reader", "ReaderAgent"),
+    "ExtractorAgent": ("documind.agents.extractor", "ExtractorAgent"),
+    "AnalyzerAgent": ("documind.agents.analyzer", "AnalyzerAgent"),
+    "QAAgent": ("documind.agents.qa_agent", "QAAgent"),
+    "MemoryAgent": ("documind.agents.memory", "MemoryAgent"),
+    "EvaluatorAgent": ("documind.agents.evaluator", "EvaluatorAgent"),
+}
 
 __all__ = [
     "DocuMind",
@@ -25,3 +31,15 @@ __all__ = [
     "EvaluatorAgent",
 ]
 
+
+def __getattr__(name):
+    if name not in _LAZY:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    module_name, attr = _LAZY[name]
+    value = getattr(importlib.import_module(module_name), attr)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
@@ -1,11 +1,17 @@
 """DocuMind Agents Module"""
 
-from .reader import ReaderAgent
-from .extractor import ExtractorAgent
-from .analyzer import AnalyzerAgent
-from .qa_agent import QAAgent
-from .memory import MemoryAgent
-from .evaluator import EvaluatorAgent
+import importlib
+
+# Imported on first access so that using one agent does not load the
+# model dependencies of all the others (PEP 562)
+_LAZY = {
+    "ReaderAgent": ("documind.agents.reader", "ReaderAgent"),
+    "ExtractorAgent": ("documind.agents.extractor", "ExtractorAgent"),
+    "AnalyzerAgent": ("documind.agents.analyzer", "AnalyzerAgent"),
+    "QAAgent": ("documind.agents.qa_agent", "QAAgent"),
+    "MemoryAgent": ("documind.agents.memory", "MemoryAgent"),
+    "EvaluatorAgent": ("documind.agents.evaluator", "EvaluatorAgent"),
+}
 
 __all__ = [
     "ReaderAgent",
@@ -16,3 +22,15 @@ __all__ = [
     "EvaluatorAgent",
 ]
 
+
+def __getattr__(name):
+    if name not in _LAZY:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    module_name, attr = _LAZY[name]
+    value = getattr(importlib.import_module(module_name), attr)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
@@ -3,11 +3,73 @@ Analyzer Agent - Produces three summary types: executive, bullet, and TL;DR
 Uses FREE Hugging Face models - No API key required!
 """
 
-from typing import Dict, Optional
+from typing import Dict, Iterator, List, Optional
+from concurrent.futures import ThreadPoolExecutor
+import functools
+import heapq
+from operator import itemgetter
+import threading
+import numpy as np
+from sklearn.feature_extraction.text import CountVectorizer
 from transformers import pipeline
 from loguru import logger
 import os
 
+from ..memory.summary_cache import SummaryCache
+
+
+@functools.lru_cache(maxsize=4)
+def _get_summarizer(model_name: str):
+    """
+    Load a summarization pipeline once per model name and share it across agents
+    
+    Args:
+        model_name: Hugging Face model name for summarization
+    
+    Returns:
+        Summarization pipeline
+    """
+    return pipeline("summarization", model=model_name, device=-1, batch_size=4)  # device=-1 uses CPU
+
+
+@functools.lru_cache(maxsize=4)
+def _load_quantized_summarizer(model_name: str):
+    """
+    Build a summarization pipeline over a dynamically int8-quantized ONNX export
+    
+    The export is written once under .documind_models/ and reused afterwards.
+    
+    Args:
+        model_name: Hugging Face model name for summarization
+    
+    Returns:
+        Summarization pipeline backed by ONNX Runtime
+    """
+    from optimum.onnxruntime import ORTModelForSeq2SeqLM, ORTQuantizer
+    from optimum.onnxruntime.configuration import AutoQuantizationConfig
+    from transformers import AutoTokenizer
+    
+    save_dir = os.path.join(".documind_models", model_name.replace("/", "--") + "-int8")
+    if not os.path.isdir(save_dir):
+        onnx_dir = save_dir + "-onnx"
+        model = ORTModelForSeq2SeqLM.from_pretrained(model_name, export=True)
+        model.save_pretrained(onnx_dir)
+        qconfig = AutoQuantizationConfig.avx512_vnni(is_static=False, per_channel=False)
+        # Seq2seq exports are split into encoder/decoder graphs, each quantized on its own
+        for file_name in ("encoder_model.onnx", "decoder_model.onnx", "decoder_with_past_model.onnx"):
+            if os.path.exists(os.path.join(onnx_dir, file_name)):
+                quantizer = ORTQuantizer.from_pretrained(onnx_dir, file_name=file_name)
+                quantizer.quantize(save_dir=save_dir, quantization_config=qconfig)
+    
+    model = ORTModelForSeq2SeqLM.from_pretrained(
+        save_dir,
+        encoder_file_name="encoder_model_quantized.onnx",
+        decoder_file_name="decoder_model_quantized.onnx",
+        decoder_with_past_file_name="decoder_with_past_model_quantized.onnx",
+    )
+    tokenizer = AutoTokenizer.from_pretrained(model_name)
+    return pipeline("summarization", model=model, tokenizer=tokenizer, batch_size=4)
+
 
 class AnalyzerAgent:
     """
@@ -17,22 +79,79 @@ class AnalyzerAgent:
     - TL;DR summary: Very brief summary
     """
     
-    def __init__(self, model_name: str = "facebook/bart-large-cnn"):
+    def __init__(
+        self,
+        model_name: str = "facebook/bart-large-cnn",
+        quantize: bool = False,
+        cache_path: Optional[str] = "./.documind_cache"
+    ):
         """
         Initialize Analyzer Agent with FREE Hugging Face models
         
         Args:
             model_name: Hugging Face model name for summarization
+            quantize: Run the model as a dynamic int8 ONNX Runtime export (needs optimum[onnxruntime])
+            cache_path: Directory for cached summaries, or None to disable caching
         """
         self.model_name = model_name
+        self.cache = None
+        if cache_path:
+            try:
+                self.cache = SummaryCache(cache_path)
+            except Exception as e:
+                logger.warning(f"Summary cache disabled: {e}")
+        self.summarizer = None
+        self.quantized = False
+        if quantize:
+            try:
+                logger.info(f"Loading int8-quantized summarization model: {model_name}")
+                self.summarizer = _load_quantized_summarizer(model_name)
+                self.quantized = True
+                logger.info("Quantized summarization model loaded successfully!")
+            except ImportError:
+                logger.warning("optimum[onnxruntime] not installed, loading the FP32 model instead")
+            except Exception as e:
+                logger.warning(f"Error quantizing summarization model, loading the FP32 model instead: {e}")
+        if self.summarizer is None:
+            try:
+                logger.info(f"Loading FREE summarization model: {model_name}")
+                self.summarizer = _get_summarizer(model_name)
+                logger.info("Summarization model loaded successfully!")
+            except Exception as e:
+                logger.error(f"Error loading summarization model: {e}")
+                logger.info("Falling back to extractive summarization")
+                self.summarizer = None
+        
+        # The pipeline's tokenizer must not be driven from two threads at once,
+        # so model calls are serialized while the NLTK-based work runs alongside
+        self._summarizer_lock = threading.Lock()
+        
+        # Resolve the Punkt data once here rather than on every summary call
+        import nltk
         try:
-            logger.info(f"Loading FREE summarization model: {model_name}")
-            self.summarizer = pipeline("summarization", model=model_name, device=-1)  # device=-1 uses CPU
-            logger.info("Summarization model loaded successfully!")
-        except Exception as e:
-            logger.error(f"Error loading summarization model: {e}")
-            logger.info("Falling back to extractive summarization")
-            self.summarizer = None
+            nltk.data.find('tokenizers/punkt')
+        except LookupError:
+            try:
+                nltk.download('punkt', quiet=True)
+            except Exception as e:
+                logger.warning(f"Could not download NLTK punkt data: {e}")
+        from nltk.tokenize import sent_tokenize
+        self._sent_tokenize = sent_tokenize
+        
+        # NLTK's English stopwords for sentence scoring, also resolved once; without
+        # the data every word counts, as before
+        try:
+            nltk.data.find('corpora/stopwords')
+        except LookupError:
+            try:
+                nltk.download('stopwords', quiet=True)
+            except Exception as e:
+                logger.warning(f"Could not download NLTK stopwords: {e}")
+        try:
+            from nltk.corpus import stopwords
+            self._stop_words = frozenset(stopwords.words('english'))
+        except Exception:
+            self._stop_words = frozenset()
     
     def generate_summaries(self, document: Dict, custom_instructions: Optional[Dict] = None) -> Dict:
         """
@@ -48,21 +167,69 @@ class AnalyzerAgent:
         text = document.get("text", "")
         metadata = document.get("metadata", {})
         
-        summaries = {
-            "executive": self.generate_executive_summary(text, metadata),
-            "bullet": self.generate_bullet_summary(text, metadata),
-            "tldr": self.generate_tldr_summary(text, metadata)
-        }
+        # Identical text, model and instructions always produce the same summaries
+        cache_key = None
+        if self.cache:
+            if not self.summarizer:
+                backend = "extractive"
+            elif self.quantized:
+                backend = f"{self.model_name}:int8"
+            else:
+                backend = self.model_name
+            cache_key = SummaryCache.make_key(text, backend, custom_instructions)
+            cached = self.cache.get(cache_key)
+            if cached is not None:
+                logger.info("Using cached summaries")
+                return cached
+        
+        # Split the shared document window once; the bullet summary reads the
+        # first 10k chars and the executive summary the 5k prefix of them
+        try:
+            sentences = self._sent_tokenize(text[:10000])
+            executive_sentences = self._window_sentences(text, sentences, 5000)
+        except Exception as e:
+            logger.error(f"Error splitting sentences: {e}")
+            sentences = executive_sentences = None
+        
+        # Summaries that fell back after an error are returned but not cached
+        errors = []
+        
+        # The bullet summary is independent of the model, so run it concurrently
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            bullet_future = executor.submit(self.generate_bullet_summary, text, metadata, sentences, errors)
+            
+            executive = self.generate_executive_summary(text, metadata, executive_sentences, errors)
+            # Condense the executive summary instead of re-reading the document,
+            # so the long input only goes through the model once
+            source_summary = executive if len(text.strip()) >= 100 else None
+            tldr = self.generate_tldr_summary(text, metadata, source_summary=source_summary, errors=errors)
+            
+            summaries = {
+                "executive": executive,
+                "bullet": bullet_future.result(),
+                "tldr": tldr
+            }
+        
+        if cache_key and not errors:
+            self.cache.set(cache_key, summaries)
         
         return summaries
     
-    def generate_executive_summary(self, text: str, metadata: Dict) -> str:
+    def generate_executive_summary(
+        self,
+        text: str,
+        metadata: Dict,
+        sentences: Optional[List[str]] = None,
+        errors: Optional[List[str]] = None
+    ) -> str:
         """
         Generate executive summary using FREE model
         
         Args:
             text: Document text
             metadata: Document metadata
+            sentences: Optional pre-split sentences of the first 5k chars
+            errors: Optional list the error is appended to when a fallback summary is returned
         
         Returns:
             Executive summary text
@@ -82,29 +249,123 @@ class AnalyzerAgent:
                 text_chunk = text
             
             if self.summarizer:
-                # Use Hugging Face model
-                summary = self.summarizer(
-                    text_chunk,
-                    max_length=max_length,
-                    min_length=min_length,
-                    do_sample=False
-                )
-                return summary[0]['summary_text']
+                # Summarize sentence-aligned sections in one batched forward pass
+                # instead of a single over-long input
+                if sentences is None:
+                    sentences = self._sent_tokenize(text_chunk)
+                sections = self._pack_sentences(sentences, max_chars=len(text_chunk)) or [text_chunk]
+                n = len(sections)
+                with self._summarizer_lock:
+                    outputs = self.summarizer(
+                        sections,
+                        batch_size=n,
+                        max_length=max(64, max_length // n),
+                        min_length=max(20, min_length // n),
+                        do_sample=False,
+                        truncation=True
+                    )
+                return " ".join(output['summary_text'] for output in outputs)
             else:
                 # Fallback to extractive summary
-                return self._extractive_summary(text_chunk, max_sentences=5)
+                return self._extractive_summary(text_chunk, max_sentences=5, sentences=sentences)
                 
         except Exception as e:
             logger.error(f"Error generating executive summary: {e}")
-            return self._extractive_summary(text[:5000], max_sentences=5)
+            if errors is not None:
+                errors.append(f"executive: {e}")
+            return self._extractive_summary(text[:5000], max_sentences=5, sentences=sentences)
+    
+    def stream_executive_summary(self, text: str, metadata: Dict, sentences: Optional[List[str]] = None) -> Iterator[str]:
+        """
+        Stream the executive summary as the model decodes it
+        
+        Sections are decoded one after another with greedy search, since
+        streaming cannot follow beam search; the text may therefore differ
+        slightly from generate_executive_summary. "".join() the pieces for
+        the complete summary.
+        
+        Args:
+            text: Document text
+            metadata: Document metadata
+            sentences: Optional pre-split sentences of the document
+        
+        Yields:
+            Summary text fragments
+        """
+        if not text or len(text.strip()) < 100:
+            yield "Document is too short to generate a summary."
+            return
+        
+        if not self.summarizer:
+            yield self.generate_executive_summary(text, metadata, sentences)
+            return
+        
+        text_chunk = text[:5000]
+        started = False
+        try:
+            from transformers import TextIteratorStreamer
+            
+            if sentences is None:
+                sentences = self._sent_tokenize(text_chunk)
+            sections = self._pack_sentences(sentences, max_chars=len(text_chunk)) or [text_chunk]
+            n = len(sections)
+            tokenizer = self.summarizer.tokenizer
+            model = self.summarizer.model
+            
+            for i, section in enumerate(sections):
+                streamer = TextIteratorStreamer(tokenizer, skip_prompt=True, skip_special_tokens=True)
+                
+                def _generate(section=section, streamer=streamer):
+                    # The lock is held by this worker only while the model runs; the
+                    # streamer queues every decoded piece, so generation finishes and
+                    # releases it however slowly the pieces are consumed below
+                    try:
+                        with self._summarizer_lock:
+                            inputs = tokenizer(section, return_tensors="pt", truncation=True, max_length=1024)
+                            model.generate(
+                                **inputs,
+                                streamer=streamer,
+                                max_length=max(64, 1024 // n),
+                                min_length=max(20, 100 // n),
+                                num_beams=1,
+                                do_sample=False
+                            )
+                    except Exception as e:
+                        # Unblock the consumer loop below instead of leaving it waiting
+                        logger.error(f"Error generating streamed summary: {e}")
+                        streamer.end()
+                
+                # generate() feeds the streamer from a worker thread while
+                # the decoded pieces are yielded here, without the lock
+                worker = threading.Thread(target=_generate)
+                worker.start()
+                if i:
+                    yield " "
+                for piece in streamer:
+                    started = True
+                    yield piece
+                worker.join()
+        
+        except Exception as e:
+            logger.error(f"Error streaming executive summary: {e}")
+            if not started:
+                yield self._extractive_summary(text_chunk, max_sentences=5, sentences=sentences)
     
-    def generate_bullet_summary(self, text: str, metadata: Dict) -> str:
+    def generate_bullet_summary(
+        self,
+        text: str,
+        metadata: Dict,
+        sentences: Optional[List[str]] = None,
+        errors: Optional[List[str]] = None
+    ) -> str:
         """
         Generate bullet-point summary
         
         Args:
             text: Document text
             metadata: Document metadata
+            sentences: Optional pre-split sentences of the first 10k chars
+            errors: Optional list the error is appended to when an error message is returned
         
         Returns:
             Bullet-point summary text
@@ -114,24 +375,14 @@ class AnalyzerAgent:
         
         try:
             # For bullet points, we'll extract key sentences and format them
-            import nltk
-            try:
-                nltk.download('punkt', quiet=True)
-                nltk.download('stopwords', quiet=True)
-            except:
-                pass
-            
-            from nltk.tokenize import sent_tokenize
-            from nltk.corpus import stopwords
-            
-            # Get sentences
-            sentences = sent_tokenize(text[:10000])  # Limit to first 10k chars
+            if sentences is None:
+                sentences = self._sent_tokenize(text[:10000])  # Limit to first 10k chars
             
             # Score sentences (simple TF-IDF-like approach)
             scored_sentences = self._score_sentences(sentences)
             
             # Get top sentences
-            top_sentences = sorted(scored_sentences, key=lambda x: x[1], reverse=True)[:10]
+            top_sentences = heapq.nlargest(10, scored_sentences, key=itemgetter(1))
             
             # Format as bullets
             bullet_points = []
@@ -142,15 +393,26 @@ class AnalyzerAgent:
             
         except Exception as e:
             logger.error(f"Error generating bullet summary: {e}")
+            if errors is not None:
+                errors.append(f"bullet: {e}")
             return "Error generating bullet summary. Please try again."
     
-    def generate_tldr_summary(self, text: str, metadata: Dict) -> str:
+    def generate_tldr_summary(
+        self,
+        text: str,
+        metadata: Dict,
+        source_summary: Optional[str] = None,
+        errors: Optional[List[str]] = None
+    ) -> str:
         """
         Generate TL;DR summary (very brief)
         
         Args:
             text: Document text
             metadata: Document metadata
+            source_summary: Optional longer summary of the document to condense
+                instead of the document text itself
+            errors: Optional list the error is appended to when a fallback summary is returned
         
         Returns:
             TL;DR summary text
@@ -160,43 +422,82 @@ class AnalyzerAgent:
         
         try:
             # Use summarizer with very short length
-            text_chunk = text[:3000]  # Limit for TL;DR
+            text_chunk = source_summary or text[:3000]  # Limit for TL;DR
             
             if self.summarizer:
-                summary = self.summarizer(
-                    text_chunk,
-                    max_length=150,
-                    min_length=30,
-                    do_sample=False
-                )
+                with self._summarizer_lock:
+                    summary = self.summarizer(
+                        text_chunk,
+                        max_length=150,
+                        min_length=30,
+                        do_sample=False
+                    )
                 return summary[0]['summary_text']
             else:
                 # Fallback: first few sentences
-                import nltk
-                try:
-                    nltk.download('punkt', quiet=True)
-                except:
-                    pass
-                from nltk.tokenize import sent_tokenize
-                sentences = sent_tokenize(text_chunk)
+                sentences = self._sent_tokenize(text_chunk)
                 return " ".join(sentences[:2])  # First 2 sentences
                 
         except Exception as e:
             logger.error(f"Error generating TL;DR summary: {e}")
+            if errors is not None:
+                errors.append(f"tldr: {e}")
             # Simple fallback
             return text[:200] + "..." if len(text) > 200 else text
     
-    def _extractive_summary(self, text: str, max_sentences: int = 5) -> str:
+    def _pack_sentences(self, sentences: List[str], max_chars: int, section_chars: int = 2000) -> List[str]:
+        """
+        Pack consecutive sentences into sections of about section_chars
+        (~500 BART tokens), stopping once max_chars of text are covered
+        """
+        sections = []
+        current = []
+        current_len = 0
+        total = 0
+        
+        for sentence in sentences:
+            total += len(sentence)
+            if total > max_chars and (sections or current):
+                break
+            if current and current_len + len(sentence) > section_chars:
+                sections.append(" ".join(current))
+                current = []
+                current_len = 0
+            current.append(sentence)
+            current_len += len(sentence) + 1
+        
+        if current:
+            sections.append(" ".join(current))
+        
+        return sections
+    
+    def _window_sentences(self, text: str, sentences: List[str], max_chars: int) -> List[str]:
+        """
+        Cut sentences split from a prefix of text down to its first max_chars
+        
+        Sentences ending past max_chars are dropped and the text they start
+        before the cut is kept as a final partial sentence, as splitting
+        text[:max_chars] directly would give.
+        """
+        window = []
+        end = 0
+        for sentence in sentences:
+            start = text.find(sentence, end)
+            if start < 0 or start + len(sentence) > max_chars:
+                break
+            window.append(sentence)
+            end = start + len(sentence)
+        
+        tail = text[end:max_chars].strip()
+        if tail:
+            window.append(tail)
+        return window
+    
+    def _extractive_summary(self, text: str, max_sentences: int = 5, sentences: Optional[List[str]] = None) -> str:
         """Simple extractive summary as fallback"""
         try:
-            import nltk
-            try:
-                nltk.download('punkt', quiet=True)
-            except:
-                pass
-            from nltk.tokenize import sent_tokenize
-            
-            sentences = sent_tokenize(text)
+            if sentences is None:
+                sentences = self._sent_tokenize(text)
             if len(sentences) <= max_sentences:
                 return " ".join(sentences)
             
@@ -209,37 +510,33 @@ class AnalyzerAgent:
             return " ".join(words[:100]) + "..." if len(words) > 100 else text
     
     def _score_sentences(self, sentences: list) -> list:
-        """Score sentences for importance (simple TF-IDF approach)"""
+        """Score sentences by the mean document frequency of their words"""
         try:
-            from nltk.corpus import stopwords
-            from collections import Counter
+            if not sentences:
+                return []
             
-            # Get all words
-            all_words = []
-            for sentence in sentences:
-                words = sentence.lower().split()
-                all_words.extend([w for w in words if w.isalnum()])
+            stop_words = self._stop_words
             
-            # Count word frequencies
-            word_freq = Counter(all_words)
+            def analyze(sentence):
+                # Lowercased whitespace-separated words that are entirely alphanumeric
+                # ("end." and "don't" are skipped), minus the stopwords
+                return [w for w in (t.lower() for t in sentence.split() if t.isalnum()) if w not in stop_words]
             
-            # Remove stopwords
+            vectorizer = CountVectorizer(analyzer=analyze)
             try:
-                stop_words = set(stopwords.words('english'))
-            except:
-                stop_words = set()
-            
-            # Score sentences
-            scored = []
-            for sentence in sentences:
-                words = [w.lower() for w in sentence.split() if w.isalnum() and w.lower() not in stop_words]
-                if words:
-                    score = sum(word_freq.get(w, 0) for w in words) / len(words)
-                    scored.append((sentence, score))
-                else:
-                    scored.append((sentence, 0))
-            
-            return scored
+                counts = vectorizer.fit_transform(sentences)  # sentences x terms (CSR)
+            except ValueError:
+                # Nothing but stopwords
+                return [(s, 0) for s in sentences]
+            
+            # Same score as the per-word average of Counter lookups over the same
+            # words, computed as one sparse mat-vec instead of a Python loop
+            word_freq = np.asarray(counts.sum(axis=0)).ravel()
+            totals = counts @ word_freq
+            lengths = np.asarray(counts.sum(axis=1)).ravel()
+            scores = np.divide(totals, lengths, out=np.zeros(len(sentences)), where=lengths > 0)
+            
+            return list(zip(sentences, scores.tolist()))
         except Exception as e:
             logger.error(f"Error scoring sentences: {e}")
             # Return sentences with equal scores
@@ -3,7 +3,10 @@ Extractor Agent - Identifies tables, numerical values, dates, tasks, and named e
 """
 
 import re
-from typing import Dict, List, Optional
+import functools
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
 import dateparser
 import spacy
 from loguru import logger
@@ -11,6 +14,97 @@ from loguru import logger
 from ..tools.table_extractor import TableExtractor
 
 
+_MONTHS = r'(?:January|February|March|April|May|June|July|August|September|October|November|December)'
+
+# Every literal pattern is fused into one alternation compiled at import, so
+# extract_all walks the text a single time and dispatches on match.lastgroup
+_METRIC_PATTERNS = [
+    ("currency", r'\$[\d,]+(?:\.\d{2})?'),
+    ("percentage", r'[\d,]+(?:\.\d+)?%'),
+    ("large_number", r'[\d,]+(?:\.\d+)?\s*(?:million|billion|thousand|M|B|K)'),
+    ("decimal", r'\d+\.\d+'),
+]
+
+_DATE_PATTERNS = [
+    ("date_numeric", r'\b\d{1,2}[/-]\d{1,2}[/-]\d{2,4}\b'),  # MM/DD/YYYY
+    ("date_month_first", r'\b' + _MONTHS + r'\s+\d{1,2},?\s+\d{4}\b'),
+    ("date_day_first", r'\b\d{1,2}\s+' + _MONTHS + r'\s+\d{4}\b'),
+]
+
+_TASK_PATTERNS = [
+    ("task_action", r'(?:action|task|todo|must|should|need to|required to).{0,100}'),
+    ("task_deadline", r'(?:deadline|due date|by|before).{0,100}'),
+]
+
+# Tasks run up to 100 characters and contain dates and metrics, and a date can
+# end in a metric, so every group is captured inside a lookahead and consumes
+# nothing; _scan_all drops the overlaps each standalone finditer would skip.
+# The leading class holds every character a pattern can start with (digits,
+# "$", ",", month and keyword initials) so other positions are rejected early
+_COMBINED_RE = re.compile(
+    r'(?=[\d$,abdfjmnorst])(?:'
+    + "|".join(
+        f"(?=(?P<{name}>{pattern}))"
+        for name, pattern in _DATE_PATTERNS + _METRIC_PATTERNS + _TASK_PATTERNS
+    )
+    + ")",
+    re.IGNORECASE,
+)
+
+# The alternation reports only the first pattern matching at a position, so the
+# later ones are tried on their own there ("12.5%" is also the decimal "12.5")
+_SCAN_PATTERNS = [
+    (name, re.compile(pattern, re.IGNORECASE), bucket)
+    for patterns, bucket in ((_DATE_PATTERNS, "dates"), (_METRIC_PATTERNS, "metrics"), (_TASK_PATTERNS, "tasks"))
+    for name, pattern in patterns
+]
+_SCAN_ORDER = {name: index for index, (name, _, _) in enumerate(_SCAN_PATTERNS)}
+
+# strptime formats tried per date pattern before falling back to dateparser,
+# which probes many locales and formats on every call
+_DATE_FORMATS = {
+    "date_numeric": ("%m/%d/%Y", "%m/%d/%y", "%m-%d-%Y", "%m-%d-%y"),
+    "date_month_first": ("%B %d %Y",),
+    "date_day_first": ("%d %B %Y",),
+}
+
+_TASK_DUE_DATE_RE = re.compile(r'\b\d{1,2}[/-]\d{1,2}[/-]\d{2,4}\b')
+
+
+def _parse_date(kind: str, date_str: str) -> Optional[datetime]:
+    """
+    Parse a matched date string with the formats known for its pattern
+    
+    Args:
+        kind: Name of the date pattern that matched
+        date_str: Matched date string
+    
+    Returns:
+        Parsed datetime, or None if neither strptime nor dateparser understands it
+    """
+    normalized = date_str if kind == "date_numeric" else " ".join(date_str.replace(",", " ").split())
+    for fmt in _DATE_FORMATS.get(kind, ()):
+        try:
+            return datetime.strptime(normalized, fmt)
+        except ValueError:
+            continue
+    return dateparser.parse(date_str)
+
+
+# Only doc.ents is read, so the components feeding POS tags, parses and lemmas are skipped
+_UNUSED_SPACY_PIPES = ("tagger", "parser", "lemmatizer", "attribute_ruler")
+
+
+@functools.lru_cache(maxsize=4)
+def _load_spacy_model(model_name: str):
+    """Load a spaCy model once per name, with its unused components disabled, and share it across agents"""
+    nlp = spacy.load(model_name)
+    for name in _UNUSED_SPACY_PIPES:
+        if name in nlp.pipe_names:
+            nlp.disable_pipe(name)
+    return nlp
+
+
 class ExtractorAgent:
     """
     Extractor Agent identifies and extracts structured information:
@@ -29,29 +123,21 @@ class ExtractorAgent:
             spacy_model: spaCy model name
         """
         try:
-            self.nlp = spacy.load(spacy_model)
+            self.nlp = _load_spacy_model(spacy_model)
         except OSError:
             logger.warning(f"spaCy model {spacy_model} not found. Loading small English model.")
             try:
-                self.nlp = spacy.load("en_core_web_sm")
+                self.nlp = _load_spacy_model("en_core_web_sm")
             except:
                 logger.error("spaCy model not available. Some features may not work.")
                 self.nlp = None
         
-        self.table_extractor = TableExtractor()
+        # Describe every NER label once instead of calling spacy.explain per entity
+        self._label_desc = {}
+        if self.nlp and "ner" in self.nlp.pipe_names:
+            self._label_desc = {label: spacy.explain(label) for label in self.nlp.get_pipe("ner").labels}
         
-        # Patterns for extraction
-        self.metric_patterns = [
-            r'\$[\d,]+(?:\.\d{2})?',  # Currency
-            r'[\d,]+(?:\.\d+)?%',      # Percentages
-            r'[\d,]+(?:\.\d+)?\s*(?:million|billion|thousand|M|B|K)',  # Large numbers
-            r'\d+\.\d+',                # Decimals
-        ]
-        
-        self.task_patterns = [
-            r'(?:action|task|todo|must|should|need to|required to)',
-            r'(?:deadline|due date|by|before)',
-        ]
+        self.table_extractor = TableExtractor()
     
     def extract_all(self, document: Dict) -> Dict:
         """
@@ -75,170 +161,179 @@ class ExtractorAgent:
         metadata = document.get("metadata", {})
         source = metadata.get("source", "")
         
-        # Extract tables if PDF
-        if metadata.get("source_type") == "pdf" and source:
-            try:
-                extractions["tables"] = self.table_extractor.extract_tables_from_pdf(source)
-            except Exception as e:
-                logger.error(f"Error extracting tables: {e}")
+        # Table extraction reads the PDF and spaCy spends most of its time in
+        # compiled code, so both overlap with the regex work on this thread
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            tables_future = None
+            if metadata.get("source_type") == "pdf" and source:
+                tables_future = executor.submit(self.table_extractor.extract_tables_from_pdf, source)
+            entities_future = executor.submit(self.extract_entities, text)
+            
+            # One regex pass feeds the metric, date and task extractors
+            scan = self._scan_all(text)
+            
+            # Extract metrics
+            extractions["metrics"] = self.extract_metrics(text, matches=scan["metrics"])
+            
+            # Extract dates
+            extractions["dates"] = self.extract_dates(text, matches=scan["dates"])
+            
+            # Extract tasks
+            extractions["tasks"] = self.extract_tasks(text, matches=scan["tasks"])
+            
+            # Extract tables if PDF
+            if tables_future is not None:
+                try:
+                    extractions["tables"] = tables_future.result()
+                except Exception as e:
+                    logger.error(f"Error extracting tables: {e}")
+            
+            # Extract named entities
+            extractions["entities"] = entities_future.result()
         
-        # Extract metrics
-        extractions["metrics"] = self.extract_metrics(text)
-        
-        # Extract dates
-        extractions["dates"] = self.extract_dates(text)
-        
-        # Extract tasks
-        extractions["tasks"] = self.extract_tasks(text)
+        return extractions
+    
+    def _scan_all(self, text: str) -> Dict[str, List[Tuple[str, int, int]]]:
+        """
+        Scan text once for metrics, dates and tasks
         
-        # Extract named entities
-        extractions["entities"] = self.extract_entities(text)
+        Args:
+            text: Input text
         
-        return extractions
+        Returns:
+            Dictionary of (group name, start, end) spans keyed by "metrics", "dates" and "tasks"
+        """
+        buckets = {"metrics": [], "dates": [], "tasks": []}
+        span_ends = {}
+        
+        for match in _COMBINED_RE.finditer(text):
+            first = match.lastgroup
+            start = match.start()
+            for name, pattern, bucket in _SCAN_PATTERNS[_SCAN_ORDER[first]:]:
+                # Skip spans overlapping the previous one from the same pattern,
+                # exactly as a standalone finditer over that pattern would
+                if start < span_ends.get(name, 0):
+                    continue
+                if name == first:
+                    end = match.end(name)
+                else:
+                    other = pattern.match(text, start)
+                    if other is None:
+                        continue
+                    end = other.end()
+                span_ends[name] = end
+                buckets[bucket].append((name, start, end))
+        
+        return buckets
     
-    def extract_metrics(self, text: str) -> List[Dict]:
+    def extract_metrics(self, text: str, matches: Optional[List[Tuple[str, int, int]]] = None) -> List[Dict]:
         """
         Extract numerical metrics from text
         
         Args:
             text: Input text
+            matches: Metric spans from _scan_all, scanned here when omitted
         
         Returns:
             List of metric dictionaries
         """
-        metrics = []
+        if matches is None:
+            matches = self._scan_all(text)["metrics"]
         
-        # Find all metric patterns
-        for pattern in self.metric_patterns:
-            matches = re.finditer(pattern, text, re.IGNORECASE)
-            for match in matches:
-                context_start = max(0, match.start() - 50)
-                context_end = min(len(text), match.end() + 50)
-                context = text[context_start:context_end]
-                
-                metrics.append({
-                    "value": match.group(),
-                    "type": self._classify_metric_type(match.group()),
-                    "context": context.strip(),
-                    "position": match.start()
-                })
+        metrics = []
         
-        # Remove duplicates and sort
-        unique_metrics = []
-        seen = set()
-        for metric in metrics:
-            key = (metric["value"], metric["position"])
-            if key not in seen:
-                seen.add(key)
-                unique_metrics.append(metric)
+        # The name of the pattern group that matched is the metric type
+        for metric_type, start, end in matches:
+            context_start = max(0, start - 50)
+            context_end = min(len(text), end + 50)
+            context = text[context_start:context_end]
+            
+            metrics.append({
+                "value": text[start:end],
+                "type": metric_type,
+                "context": context.strip(),
+                "position": start
+            })
         
-        return sorted(unique_metrics, key=lambda x: x["position"])
-    
-    def _classify_metric_type(self, value: str) -> str:
-        """Classify metric type"""
-        if '$' in value:
-            return "currency"
-        elif '%' in value:
-            return "percentage"
-        elif any(term in value.lower() for term in ['million', 'billion', 'thousand', 'm', 'b', 'k']):
-            return "large_number"
-        elif '.' in value:
-            return "decimal"
-        else:
-            return "integer"
+        # Spans from _scan_all arrive in position order (pattern order at equal
+        # positions) and never repeat a value at a position, so there is nothing
+        # to deduplicate or sort
+        return metrics
     
-    def extract_dates(self, text: str) -> List[Dict]:
+    def extract_dates(self, text: str, matches: Optional[List[Tuple[str, int, int]]] = None) -> List[Dict]:
         """
         Extract dates from text
         
         Args:
             text: Input text
+            matches: Date spans from _scan_all, scanned here when omitted
         
         Returns:
             List of date dictionaries
         """
+        if matches is None:
+            matches = self._scan_all(text)["dates"]
+        
         dates = []
         
-        # Use dateparser to find dates
-        # Simple approach: look for date-like patterns
-        date_patterns = [
-            r'\b\d{1,2}[/-]\d{1,2}[/-]\d{2,4}\b',  # MM/DD/YYYY
-            r'\b(?:January|February|March|April|May|June|July|August|September|October|November|December)\s+\d{1,2},?\s+\d{4}\b',
-            r'\b\d{1,2}\s+(?:January|February|March|April|May|June|July|August|September|October|November|December)\s+\d{4}\b',
-        ]
-        
-        for pattern in date_patterns:
-            matches = re.finditer(pattern, text, re.IGNORECASE)
-            for match in matches:
-                date_str = match.group()
-                parsed_date = dateparser.parse(date_str)
+        # Parse the date-like spans with the formats of the pattern that matched
+        for kind, start, end in matches:
+            date_str = text[start:end]
+            parsed_date = _parse_date(kind, date_str)
+            
+            if parsed_date:
+                context_start = max(0, start - 50)
+                context_end = min(len(text), end + 50)
+                context = text[context_start:context_end]
                 
-                if parsed_date:
-                    context_start = max(0, match.start() - 50)
-                    context_end = min(len(text), match.end() + 50)
-                    context = text[context_start:context_end]
-                    
-                    dates.append({
-                        "date_string": date_str,
-                        "parsed_date": parsed_date.isoformat(),
-                        "context": context.strip(),
-                        "position": match.start()
-                    })
-        
-        # Remove duplicates
-        unique_dates = []
-        seen = set()
-        for date in dates:
-            key = (date["date_string"], date["position"])
-            if key not in seen:
-                seen.add(key)
-                unique_dates.append(date)
+                dates.append({
+                    "date_string": date_str,
+                    "parsed_date": parsed_date.isoformat(),
+                    "context": context.strip(),
+                    "position": start
+                })
         
-        return sorted(unique_dates, key=lambda x: x["position"])
+        # Spans from _scan_all arrive in position order (pattern order at equal
+        # positions) and never repeat a value at a position, so there is nothing
+        # to deduplicate or sort
+        return dates
     
-    def extract_tasks(self, text: str) -> List[Dict]:
+    def extract_tasks(self, text: str, matches: Optional[List[Tuple[str, int, int]]] = None) -> List[Dict]:
         """
         Extract action items and tasks
         
         Args:
             text: Input text
+            matches: Task spans from _scan_all, scanned here when omitted
         
         Returns:
             List of task dictionaries
         """
-        tasks = []
-        
-        # Look for task indicators
-        task_indicators = [
-            r'(?:action|task|todo|must|should|need to|required to).{0,100}',
-            r'(?:deadline|due date|by|before).{0,100}',
-        ]
-        
-        for pattern in task_indicators:
-            matches = re.finditer(pattern, text, re.IGNORECASE)
-            for match in matches:
-                task_text = match.group().strip()
-                
-                # Extract associated date if present
-                date_match = re.search(r'\b\d{1,2}[/-]\d{1,2}[/-]\d{2,4}\b', task_text)
-                due_date = date_match.group() if date_match else None
-                
-                tasks.append({
-                    "task_text": task_text,
-                    "due_date": due_date,
-                    "position": match.start()
-                })
+        if matches is None:
+            matches = self._scan_all(text)["tasks"]
         
-        # Remove duplicates
-        unique_tasks = []
+        tasks = []
         seen = set()
-        for task in tasks:
-            key = task["task_text"][:50]  # Use first 50 chars as key
-            if key not in seen:
-                seen.add(key)
-                unique_tasks.append(task)
         
-        return sorted(unique_tasks, key=lambda x: x["position"])
+        for _, start, end in matches:
+            task_text = text[start:end].strip()
+            
+            # Skip repeated task text; spans arrive in position order, so the first occurrence is kept
+            if task_text in seen:
+                continue
+            seen.add(task_text)
+            
+            # Extract associated date if present
+            date_match = _TASK_DUE_DATE_RE.search(task_text)
+            due_date = date_match.group() if date_match else None
+            
+            tasks.append({
+                "task_text": task_text,
+                "due_date": due_date,
+                "position": start
+            })
+        
+        return tasks
     
     def extract_entities(self, text: str) -> List[Dict]:
         """
@@ -253,25 +348,52 @@ class ExtractorAgent:
         if not self.nlp:
             return []
         
+        return self._entities_from_doc(self.nlp(text))
+    
+    def extract_entities_batch(self, texts: Iterable[str], batch_size: int = 32) -> Iterator[Dict]:
+        """
+        Extract named entities from many texts, batching them through spaCy
+        
+        Args:
+            texts: Input texts
+            batch_size: Number of texts spaCy processes per batch
+        
+        Yields:
+            Entity dictionary per text, as returned by extract_entities
+        """
+        if not self.nlp:
+            for _ in texts:
+                yield []
+            return
+        
+        for doc in self.nlp.pipe(texts, batch_size=batch_size):
+            yield self._entities_from_doc(doc)
+    
+    def _entities_from_doc(self, doc) -> Dict:
+        """Build the entity dictionary for a processed spaCy doc"""
         entities = []
-        doc = self.nlp(text)
+        entities_by_type = {}
+        label_desc = self._label_desc
         
         for ent in doc.ents:
-            entities.append({
+            label = ent.label_
+            # Labels from components other than the NER model are described on first sight
+            if label not in label_desc:
+                label_desc[label] = spacy.explain(label)
+            entity = {
                 "text": ent.text,
-                "label": ent.label_,
-                "label_description": spacy.explain(ent.label_),
+                "label": label,
+                "label_description": label_desc[label],
                 "start": ent.start_char,
                 "end": ent.end_char
-            })
-        
-        # Group by type
-        entities_by_type = {}
-        for entity in entities:
-            label = entity["label"]
-            if label not in entities_by_type:
-                entities_by_type[label] = []
-            entities_by_type[label].append(entity)
+            }
+            entities.append(entity)
+            
+            # Group by type in the same pass; both views share the entity dicts
+            group = entities_by_type.get(label)
+            if group is None:
+                group = entities_by_type[label] = []
+            group.append(entity)
         
         return {
             "all": entities,
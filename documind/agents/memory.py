@@ -56,8 +56,10 @@ class MemoryAgent:
         Returns:
             Stored insights or None
         """
-        # Check session memory first
-        session_extractions = self.session_memory.context.get("extractions", {}).get(document_id)
+        # Check session memory first; the session context always holds an
+        # "extractions" dict, so no fallback dict is needed. It is looked up on
+        # each call because SessionMemory.clear() replaces the context
+        session_extractions = self.session_memory.context["extractions"].get(document_id)
         if session_extractions:
             return session_extractions
         
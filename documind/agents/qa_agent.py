@@ -3,7 +3,13 @@ Q&A Agent - Performs retrieval-augmented question answering with citations
 Uses FREE models - No API key required!
 """
 
-from typing import Dict, List, Optional
+from typing import Dict, List, NamedTuple, Optional
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+import functools
+import heapq
+from operator import itemgetter
+import threading
 import chromadb
 from chromadb.config import Settings
 from sentence_transformers import SentenceTransformer
@@ -12,6 +18,73 @@ import os
 import hashlib
 import re
 
+from ..tools.onnx_embedder import OnnxEmbedder
+from ..tools.vector_index import InMemoryVectorIndex
+
+
+# HNSW graph settings for new collections: a denser graph (M) and wider build
+# and search candidate lists trade a little memory for recall and query speed;
+# insert batching matches setup_document's batch size. Embeddings are unit
+# length, so inner product ranks exactly like cosine with one dot product
+_HNSW_METADATA = {
+    "hnsw:space": "ip",
+    "hnsw:M": 24,
+    "hnsw:construction_ef": 128,
+    "hnsw:search_ef": 100,
+    "hnsw:batch_size": 200,
+    "hnsw:sync_threshold": 1000,
+}
+
+
+# Sentence boundaries: terminal punctuation followed by whitespace and a capital
+# or digit (optionally after an opening quote/bracket), or the blank line between chunks
+_SENTENCE_SPLIT_RE = re.compile(r'(?<=[.!?])\s+(?=["\'(\[]?[A-Z0-9])|\n\s*\n')
+
+_WORD_RE = re.compile(r'\w+')
+_WHITESPACE_RE = re.compile(r'\s+')
+# Question words too common to tell sentences apart
+_STOP = frozenset({'what', 'when', 'where', 'which', 'does', 'with', 'from', 'this', 'that', 'about', 'have', 'been'})
+
+
+class RetrievedChunk(NamedTuple):
+    """A chunk returned by vector search"""
+    text: str
+    page: int
+    chunk_index: int
+    distance: float
+
+
+# Serializes first loads so concurrently constructed agents share one model
+_MODEL_LOCK = threading.Lock()
+
+
+@functools.lru_cache(maxsize=4)
+def _cached_sentence_transformer(model_name: str, device: str):
+    """Load a sentence-transformers model once per name and device"""
+    model = SentenceTransformer(model_name, device=device)
+    if device == "cuda":
+        # fp16 halves weight traffic and runs on tensor cores
+        model.half()
+    return model
+
+
+@functools.lru_cache(maxsize=1)
+def _cached_onnx_embedder():
+    """Load the int8 ONNX embedder once"""
+    return OnnxEmbedder()
+
+
+def _load_sentence_transformer(model_name: str, device: str):
+    """Return the shared sentence-transformers model for a name and device"""
+    with _MODEL_LOCK:
+        return _cached_sentence_transformer(model_name, device)
+
+
+def _load_onnx_embedder():
+    """Return the shared int8 ONNX embedder"""
+    with _MODEL_LOCK:
+        return _cached_onnx_embedder()
+
 
 class QAAgent:
     """
@@ -20,30 +93,63 @@ class QAAgent:
     Uses FREE sentence transformers - No OpenAI API required!
     """
     
-    def __init__(self):
+    def __init__(self, use_onnx: bool = False, vector_backend: str = "chroma", embedding_batch_size: int = 64):
         """
         Initialize Q&A Agent with FREE models
+        
+        Args:
+            use_onnx: Embed with an int8 ONNX Runtime export of the model (needs optimum[onnxruntime])
+            vector_backend: "chroma" for a ChromaDB collection, or "memory" for an
+                in-process numpy/hnswlib index suited to single-document Q&A
+            embedding_batch_size: Chunks per embedding model forward pass
         """
+        self.vector_backend = vector_backend
+        self.embedding_batch_size = embedding_batch_size
+        self.embedding_model = None
+        if use_onnx:
+            try:
+                logger.info("Loading int8 ONNX embedding model: all-MiniLM-L6-v2")
+                self.embedding_model = _load_onnx_embedder()
+                logger.info("ONNX embedding model loaded successfully!")
+            except ImportError:
+                logger.warning("optimum[onnxruntime] not installed, loading the PyTorch embedding model instead")
+            except Exception as e:
+                logger.warning(f"Could not load ONNX embedding model, loading the PyTorch one instead: {e}")
+        
         # Initialize embedding model (FREE - no API key needed)
+        if self.embedding_model is None:
+            self._load_embedding_model()
+        
+        # Initialize vector store
+        self.vector_store = None
+        self.collection = None
+        
+        # Recently asked questions -> embeddings, in least-recently-used order;
+        # answer() may run on several threads, so reordering is done under a lock
+        self._question_cache = OrderedDict()
+        self._question_cache_size = 1024
+        self._question_cache_lock = threading.Lock()
+    
+    def _load_embedding_model(self):
+        """Load the sentence-transformers embedding model"""
         try:
-            logger.info("Loading FREE embedding model: all-MiniLM-L6-v2")
-            self.embedding_model = SentenceTransformer('all-MiniLM-L6-v2')
+            import torch
+            device = "cuda" if torch.cuda.is_available() else "cpu"
+            logger.info(f"Loading FREE embedding model: all-MiniLM-L6-v2 on {device}")
+            self.embedding_model = _load_sentence_transformer('all-MiniLM-L6-v2', device)
             logger.info("Embedding model loaded successfully!")
         except Exception as e:
             logger.warning(f"Could not load embedding model: {e}")
             self.embedding_model = None
-        
-        # Initialize vector store
-        self.vector_store = None
-        self.collection = None
     
-    def setup_document(self, document: Dict, collection_name: Optional[str] = None):
+    def setup_document(self, document: Dict, collection_name: Optional[str] = None, batch_size: int = 200):
         """
         Set up document for Q&A by creating vector embeddings
         
         Args:
             document: Document dictionary from Reader Agent
             collection_name: Name for the vector store collection
+            batch_size: Chunks per vector store insert
         """
         if not self.embedding_model:
             logger.warning("Embedding model not available. Q&A may have limited functionality.")
@@ -54,41 +160,83 @@ class QAAgent:
             logger.warning("No chunks found in document.")
             return
         
-        # Initialize ChromaDB
+        texts = [chunk.get("text", "") for chunk in chunks]
+        ids = [f"chunk_{i}" for i in range(len(chunks))]
+        metadatas = [
+            {
+                "page": chunk.get("page", 0),
+                "chunk_index": chunk.get("chunk_index", i),
+                "char_count": chunk.get("char_count", 0)
+            }
+            for i, chunk in enumerate(chunks)
+        ]
+        
+        # Initialize the vector store
         try:
-            self.vector_store = chromadb.Client(Settings(anonymized_telemetry=False))
-            
-            # Create or get collection
-            doc_id = hashlib.md5(document.get("metadata", {}).get("source", "").encode()).hexdigest()
-            collection_name = collection_name or f"documind_{doc_id[:8]}"
-            
-            try:
-                self.collection = self.vector_store.get_collection(collection_name)
-                logger.info(f"Using existing collection: {collection_name}")
-            except:
-                self.collection = self.vector_store.create_collection(collection_name)
+            if self.vector_backend == "memory":
+                self.vector_store = None
+                self.collection = InMemoryVectorIndex()
+                logger.info("Using in-memory vector index")
+            else:
+                # Persisted on disk so embeddings survive restarts
+                self.vector_store = chromadb.PersistentClient(
+                    path=os.getenv("CHROMA_PATH", "./chroma_db"),
+                    settings=Settings(anonymized_telemetry=False)
+                )
+                
+                # Create or get collection
+                # Only names the collection, so a short non-cryptographic-strength digest is enough
+                doc_id = hashlib.blake2b(document.get("metadata", {}).get("source", "").encode(), digest_size=4).hexdigest()
+                collection_name = collection_name or f"documind_{doc_id}"
+                
+                # Fingerprint of the chunk texts, stored with the collection to detect stale embeddings
+                chunks_digest = hashlib.blake2b(digest_size=16)
+                for text in texts:
+                    chunks_digest.update(text.encode("utf-8", errors="surrogatepass") + b"\0")
+                chunks_digest = chunks_digest.hexdigest()
+                
+                try:
+                    self.collection = self.vector_store.get_collection(collection_name)
+                    metadata = self.collection.metadata or {}
+                    if metadata.get("documind:chunks_digest") == chunks_digest and self.collection.count() == len(chunks):
+                        logger.info(f"Using existing collection: {collection_name}")
+                        return
+                    logger.info(f"Collection {collection_name} is stale; rebuilding")
+                    self.vector_store.delete_collection(collection_name)
+                except Exception:
+                    pass
+                
+                self.collection = self.vector_store.create_collection(
+                    collection_name,
+                    metadata={**_HNSW_METADATA, "documind:chunks_digest": chunks_digest}
+                )
                 logger.info(f"Created new collection: {collection_name}")
             
-            # Add chunks to vector store
-            texts = [chunk.get("text", "") for chunk in chunks]
-            embeddings = self.embedding_model.encode(texts).tolist()
-            
-            ids = [f"chunk_{i}" for i in range(len(chunks))]
-            metadatas = [
-                {
-                    "page": chunk.get("page", 0),
-                    "chunk_index": chunk.get("chunk_index", i),
-                    "char_count": chunk.get("char_count", 0)
-                }
-                for i, chunk in enumerate(chunks)
-            ]
-            
-            self.collection.add(
-                embeddings=embeddings,
-                documents=texts,
-                ids=ids,
-                metadatas=metadatas
-            )
+            # Add chunks to vector store in bounded batches, encoding the next
+            # batch while a worker thread inserts the previous one
+            with ThreadPoolExecutor(max_workers=1) as executor:
+                pending = None
+                for start in range(0, len(chunks), batch_size):
+                    end = start + batch_size
+                    # encode() length-sorts the texts into mini-batches itself
+                    batch_embeddings = self.embedding_model.encode(
+                        texts[start:end],
+                        batch_size=self.embedding_batch_size,
+                        show_progress_bar=False,
+                        convert_to_numpy=True,
+                        normalize_embeddings=True
+                    )
+                    if pending is not None:
+                        pending.result()
+                    pending = executor.submit(
+                        self._insert_batch,
+                        batch_embeddings,
+                        texts[start:end],
+                        ids[start:end],
+                        metadatas[start:end]
+                    )
+                if pending is not None:
+                    pending.result()
             
             logger.info(f"Added {len(chunks)} chunks to vector store")
             
@@ -96,6 +244,19 @@ class QAAgent:
             logger.error(f"Error setting up vector store: {e}")
             self.vector_store = None
     
+    def _insert_batch(self, embeddings, texts: List[str], ids: List[str], metadatas: List[Dict]):
+        """Insert one batch of encoded chunks into the vector store"""
+        # Chroma only accepts embeddings as lists, so each batch is converted on
+        # its own; the in-memory index takes the numpy array as is
+        if not isinstance(self.collection, InMemoryVectorIndex):
+            embeddings = embeddings.tolist()
+        self.collection.add(
+            embeddings=embeddings,
+            documents=texts,
+            ids=ids,
+            metadatas=metadatas
+        )
+    
     def answer(self, question: str, top_k: int = 3, return_citations: bool = True) -> Dict:
         """
         Answer a question about the document using FREE extractive Q&A
@@ -132,11 +293,11 @@ class QAAgent:
         citations = []
         if return_citations:
             for chunk in relevant_chunks:
-                page = chunk.get("page", 0)
+                page = chunk.page
                 if page > 0:
                     citations.append({
                         "page": page,
-                        "text": chunk["text"][:200] + "..." if len(chunk["text"]) > 200 else chunk["text"]
+                        "text": chunk.text[:200] + "..." if len(chunk.text) > 200 else chunk.text
                     })
         
         # Calculate confidence
@@ -149,11 +310,11 @@ class QAAgent:
             "relevant_chunks": len(relevant_chunks)
         }
     
-    def _retrieve_relevant_chunks(self, question: str, top_k: int) -> List[Dict]:
+    def _retrieve_relevant_chunks(self, question: str, top_k: int) -> List[RetrievedChunk]:
         """Retrieve relevant chunks using vector similarity"""
         try:
             # Generate question embedding
-            question_embedding = self.embedding_model.encode([question]).tolist()[0]
+            question_embedding = self._embed_question(question)
             
             # Query vector store
             results = self.collection.query(
@@ -161,17 +322,23 @@ class QAAgent:
                 n_results=top_k
             )
             
-            # Format results
+            # Inner-product distances are 1 - cos; for unit vectors the squared L2
+            # distance used by older collections and the confidence score is twice that
+            space = (getattr(self.collection, "metadata", None) or {}).get("hnsw:space", "l2")
+            distance_scale = 2.0 if space == "ip" else 1.0
+            
+            # Format results as fixed-layout tuples rather than per-chunk dicts
             chunks = []
             if results["documents"] and len(results["documents"][0]) > 0:
+                metadatas = results["metadatas"][0]
+                distances = results["distances"][0] if "distances" in results else None
                 for i, doc in enumerate(results["documents"][0]):
-                    chunk = {
-                        "text": doc,
-                        "page": results["metadatas"][0][i].get("page", 0),
-                        "chunk_index": results["metadatas"][0][i].get("chunk_index", 0),
-                        "distance": results["distances"][0][i] if "distances" in results else 0.0
-                    }
-                    chunks.append(chunk)
+                    chunks.append(RetrievedChunk(
+                        doc,
+                        metadatas[i].get("page", 0),
+                        metadatas[i].get("chunk_index", 0),
+                        distances[i] * distance_scale if distances is not None else 0.0
+                    ))
             
             return chunks
             
@@ -179,58 +346,70 @@ class QAAgent:
             logger.error(f"Error retrieving chunks: {e}")
             return []
     
-    def _generate_extractive_answer(self, question: str, chunks: List[Dict]) -> str:
+    def _embed_question(self, question: str) -> List[float]:
+        """Embed a question, reusing the embedding of a recently asked identical question"""
+        # The model is uncased, so case and spacing differences embed identically
+        key = " ".join(question.lower().split())
+        with self._question_cache_lock:
+            embedding = self._question_cache.get(key)
+            if embedding is not None:
+                self._question_cache.move_to_end(key)
+                return embedding
+        
+        # Encoded outside the lock so other questions are not held up behind the model
+        embedding = self.embedding_model.encode([question], normalize_embeddings=True)[0].tolist()
+        with self._question_cache_lock:
+            self._question_cache[key] = embedding
+            self._question_cache.move_to_end(key)
+            if len(self._question_cache) > self._question_cache_size:
+                self._question_cache.popitem(last=False)
+        return embedding
+    
+    def _generate_extractive_answer(self, question: str, chunks: List[RetrievedChunk]) -> str:
         """
         Generate answer using extractive method (FREE - no API needed)
         Finds the most relevant sentence from chunks
         """
         try:
             # Combine all chunk texts
-            context = "\n\n".join([chunk["text"] for chunk in chunks])
+            context = "\n\n".join([chunk.text for chunk in chunks])
             
             # Simple extractive approach: find sentences that contain question keywords
-            question_keywords = set(word.lower() for word in question.split() if len(word) > 3)
+            question_keywords = frozenset(
+                word for word in _WORD_RE.findall(question.lower()) if len(word) > 3 and word not in _STOP
+            )
             
             # Split into sentences
-            import nltk
-            try:
-                nltk.download('punkt', quiet=True)
-            except:
-                pass
-            from nltk.tokenize import sent_tokenize
-            
-            sentences = sent_tokenize(context)
+            sentences = [sentence for sentence in _SENTENCE_SPLIT_RE.split(context) if sentence]
             
-            # Score sentences based on keyword matches
+            # Score sentences by the share of keywords they contain as whole words
             scored_sentences = []
             for sentence in sentences:
-                sentence_lower = sentence.lower()
-                matches = sum(1 for keyword in question_keywords if keyword in sentence_lower)
+                matches = len(question_keywords & frozenset(_WORD_RE.findall(sentence.lower())))
                 score = matches / len(question_keywords) if question_keywords else 0
                 scored_sentences.append((sentence, score))
             
             # Get top sentences
-            scored_sentences.sort(key=lambda x: x[1], reverse=True)
-            top_sentences = [s for s, score in scored_sentences[:3] if score > 0]
+            top_sentences = [s for s, score in heapq.nlargest(3, scored_sentences, key=itemgetter(1)) if score > 0]
             
             if top_sentences:
                 # Combine top sentences
                 answer = " ".join(top_sentences)
                 # Clean up
-                answer = re.sub(r'\s+', ' ', answer).strip()
+                answer = _WHITESPACE_RE.sub(' ', answer).strip()
                 return answer
             else:
                 # Fallback: return first chunk
-                return chunks[0]["text"][:500] if chunks else "I couldn't find a specific answer to your question."
+                return chunks[0].text[:500] if chunks else "I couldn't find a specific answer to your question."
                 
         except Exception as e:
             logger.error(f"Error generating answer: {e}")
             # Fallback
             if chunks:
-                return chunks[0]["text"][:500]
+                return chunks[0].text[:500]
             return "Error generating answer."
     
-    def _calculate_confidence(self, question: str, answer: str, chunks: List[Dict]) -> float:
+    def _calculate_confidence(self, question: str, answer: str, chunks: List[RetrievedChunk]) -> float:
         """Calculate confidence score (0-1)"""
         if not chunks:
             return 0.0
@@ -243,9 +422,9 @@ class QAAgent:
         elif len(chunks) == 1:
             base_confidence += 0.1
         
-        # Adjust based on distances (if available)
-        if chunks and "distance" in chunks[0]:
-            avg_distance = sum(c.get("distance", 1.0) for c in chunks) / len(chunks)
+        # Adjust based on distances
+        if chunks:
+            avg_distance = sum(c.distance for c in chunks) / len(chunks)
             # Lower distance = higher confidence
             distance_confidence = max(0, 1.0 - avg_distance)
             base_confidence = (base_confidence + distance_confidence) / 2
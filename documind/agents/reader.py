@@ -4,22 +4,72 @@ Reader Agent - Extracts text from PDFs, web pages, and scanned documents
 
 import os
 import re
+import importlib.util
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
 from typing import Dict, List, Optional, Tuple
-from pathlib import Path
 import requests
-from bs4 import BeautifulSoup
-import pdfplumber
-import PyPDF2
-from pdf2image import convert_from_path
-import pytesseract
-from PIL import Image
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 from loguru import logger
 
 from ..tools.pdf_parser import PDFParser
-from ..tools.ocr import OCRProcessor
+from ..tools.pdf_handle import open_pdf
 from ..tools.chunker import DocumentChunker
 
 
+# lxml (in requirements.txt) parses HTML several times faster than the stdlib parser
+_HTML_PARSER = "lxml" if importlib.util.find_spec("lxml") else "html.parser"
+
+# Source type by lowercased file extension
+_EXTENSION_TYPES = {
+    ".pdf": "pdf",
+    ".txt": "text",
+    ".md": "text",
+    ".text": "text",
+}
+
+# Below this many pages, process start-up costs more than parallel extraction saves
+_PARALLEL_MIN_PAGES = 8
+
+# Keep-alive connections per host, and URLs of a batch fetched at once
+_HTTP_POOL_SIZE = 10
+
+
+def _count_words(text: str, block_size: int = 1 << 16) -> int:
+    """
+    Count whitespace-separated words, as len(text.split()) would
+    
+    Large texts are split in cache-sized blocks cut at whitespace, so the full
+    list of words is never built at once.
+    """
+    n = len(text)
+    if n <= block_size:
+        return len(text.split())
+    
+    count = 0
+    start = 0
+    while start < n:
+        end = min(start + block_size, n)
+        # Move the cut to the next whitespace so no word straddles two blocks
+        while end < n and not text[end].isspace():
+            end += 1
+        count += len(text[start:end].split())
+        start = end
+    return count
+
+
+def _extract_page_texts(pdf_path: str, page_numbers: List[int]) -> List[Optional[str]]:
+    """
+    Extract text from a range of PDF pages in a worker process
+    
+    Each worker opens the PDF itself, as pdfplumber pages cannot be pickled.
+    """
+    import pdfplumber
+    
+    with pdfplumber.open(pdf_path, pages=page_numbers) as pdf:
+        return [page.extract_text() for page in pdf.pages]
+
+
 class ReaderAgent:
     """
     Reader Agent handles document ingestion from multiple sources:
@@ -29,20 +79,36 @@ class ReaderAgent:
     - OCR for scanned documents
     """
     
-    def __init__(self, ocr_enabled: bool = False, tesseract_cmd: Optional[str] = None):
+    def __init__(
+        self,
+        ocr_enabled: bool = False,
+        tesseract_cmd: Optional[str] = None,
+        pdf_workers: Optional[int] = None,
+        ocr_preprocess: bool = True,
+        ocr_workers: Optional[int] = None
+    ):
         """
         Initialize Reader Agent
         
         Args:
             ocr_enabled: Enable OCR for scanned documents (default: False - optional)
             tesseract_cmd: Path to tesseract executable (if not in PATH)
+            pdf_workers: Processes for PDF text extraction (default: min(CPU count, 4); 1 disables)
+            ocr_preprocess: Binarize page images with OpenCV before OCR
+            ocr_workers: Pages OCR'd in parallel (default: min(CPU count, 4))
         """
         self.ocr_enabled = ocr_enabled
+        self.ocr_workers = ocr_workers
+        self.pdf_workers = pdf_workers if pdf_workers is not None else min(os.cpu_count() or 1, 4)
         if ocr_enabled:
             try:
+                # OCR dependencies are only imported when OCR is requested
+                import pytesseract
+                from ..tools.ocr import OCRProcessor
+                
                 if tesseract_cmd:
                     pytesseract.pytesseract.tesseract_cmd = tesseract_cmd
-                self.ocr_processor = OCRProcessor()
+                self.ocr_processor = OCRProcessor(preprocess=ocr_preprocess)
             except Exception as e:
                 logger.warning(f"OCR not available: {e}. Continuing without OCR.")
                 self.ocr_enabled = False
@@ -53,6 +119,19 @@ class ReaderAgent:
         self.pdf_parser = PDFParser()
         self.chunker = DocumentChunker()
         
+        # Keep-alive session so repeated URL reads reuse connections instead of a new TLS handshake each
+        self._session = requests.Session()
+        self._session.headers.update({
+            "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36"
+        })
+        adapter = HTTPAdapter(
+            pool_connections=_HTTP_POOL_SIZE,
+            pool_maxsize=_HTTP_POOL_SIZE,
+            max_retries=Retry(total=3, backoff_factor=0.3, status_forcelist=(502, 503, 504))
+        )
+        self._session.mount("http://", adapter)
+        self._session.mount("https://", adapter)
+    
     def read_document(self, source: str, source_type: Optional[str] = None) -> Dict:
         """
         Read document from various sources
@@ -68,33 +147,59 @@ class ReaderAgent:
             source_type = self._detect_source_type(source)
         
         logger.info(f"Reading document from {source_type}: {source}")
+        return self._reader_for(source_type)(source)
+    
+    def read_documents(self, sources: List[str], source_types: Optional[List[Optional[str]]] = None) -> List[Dict]:
+        """
+        Read a batch of documents, classifying every source up front
         
+        Args:
+            sources: Paths to files or URLs
+            source_types: Optional per-source types ('pdf', 'text', 'url'); None entries are detected
+        
+        Returns:
+            List of document dictionaries, in the order of sources
+        """
+        if source_types is None:
+            source_types = [None] * len(sources)
+        detect = self._detect_source_type
+        readers = [
+            self._reader_for(source_type if source_type is not None else detect(source))
+            for source, source_type in zip(sources, source_types)
+        ]
+        logger.info(f"Reading batch of {len(sources)} documents")
+        
+        # Web pages are fetched concurrently over the keep-alive session, since
+        # each one mostly waits on the network
+        url_indices = [i for i, read in enumerate(readers) if read == self._read_url]
+        pages = {}
+        if len(url_indices) > 1:
+            urls = [sources[i] for i in url_indices]
+            with ThreadPoolExecutor(max_workers=min(len(urls), _HTTP_POOL_SIZE)) as executor:
+                pages = dict(zip(url_indices, executor.map(self._fetch_url, urls)))
+        
+        return [
+            self._document_from_html(source, pages[i]) if i in pages else read(source)
+            for i, (read, source) in enumerate(zip(readers, sources))
+        ]
+    
+    def _reader_for(self, source_type: str):
+        """Bound read method for a source type"""
         if source_type == "pdf":
-            return self._read_pdf(source)
+            return self._read_pdf
         elif source_type == "text":
-            return self._read_text(source)
+            return self._read_text
         elif source_type == "url":
-            return self._read_url(source)
-        else:
-            raise ValueError(f"Unsupported source type: {source_type}")
+            return self._read_url
+        raise ValueError(f"Unsupported source type: {source_type}")
     
     def _detect_source_type(self, source: str) -> str:
         """Detect source type from source string"""
-        if source.startswith("http://") or source.startswith("https://"):
+        source_lower = source.lower()
+        if source_lower.startswith(("http://", "https://")):
             return "url"
-        elif source.lower().endswith(".pdf"):
-            return "pdf"
-        elif source.lower().endswith((".txt", ".md", ".text")):
-            return "text"
-        else:
-            # Try to infer from file extension or content
-            path = Path(source)
-            if path.exists():
-                if path.suffix.lower() == ".pdf":
-                    return "pdf"
-                elif path.suffix.lower() in [".txt", ".md", ".text"]:
-                    return "text"
-            return "text"  # Default
+        # Anything without a known extension is read as text
+        return _EXTENSION_TYPES.get(os.path.splitext(source_lower)[1], "text")
     
     def _read_pdf(self, pdf_path: str) -> Dict:
         """Read PDF file with OCR fallback for scanned documents"""
@@ -103,38 +208,60 @@ class ReaderAgent:
             text_content = []
             pages_metadata = []
             
-            with pdfplumber.open(pdf_path) as pdf:
-                total_pages = len(pdf.pages)
-                
-                for page_num, page in enumerate(pdf.pages, 1):
-                    page_text = page.extract_text()
+            # One PDFium parse serves both text extraction and OCR rendering
+            with open_pdf(pdf_path) as document:
+                if document is not None:
+                    page_texts = self._extract_pages_pdfium(document)
+                    total_pages = len(page_texts)
+                else:
+                    import pdfplumber
                     
-                    # If page has no text, try OCR
-                    if not page_text or len(page_text.strip()) < 50:
-                        if self.ocr_enabled and self.ocr_processor:
-                            logger.info(f"Low text content on page {page_num}, attempting OCR")
-                            page_text = self.ocr_processor.ocr_page(pdf_path, page_num)
+                    page_texts = None
+                    with pdfplumber.open(pdf_path) as pdf:
+                        total_pages = len(pdf.pages)
+                        if self.pdf_workers <= 1 or total_pages < _PARALLEL_MIN_PAGES:
+                            page_texts = [page.extract_text() for page in pdf.pages]
                     
-                    if page_text:
-                        text_content.append(page_text)
-                        pages_metadata.append({
-                            "page": page_num,
-                            "char_count": len(page_text),
-                            "word_count": len(page_text.split()),
-                            "has_text": True
-                        })
-                    else:
-                        pages_metadata.append({
-                            "page": page_num,
-                            "char_count": 0,
-                            "word_count": 0,
-                            "has_text": False
-                        })
+                    if page_texts is None:
+                        page_texts = self._extract_pages_parallel(pdf_path, total_pages)
+                
+                # OCR every low-text page in one batch
+                if self.ocr_enabled and self.ocr_processor:
+                    ocr_needed = [
+                        page_num for page_num, page_text in enumerate(page_texts, 1)
+                        if not page_text or len(page_text.strip()) < 50
+                    ]
+                    if ocr_needed:
+                        logger.info(f"Low text content on {len(ocr_needed)} page(s), attempting OCR")
+                        ocr_texts = self.ocr_processor.ocr_pages(
+                            pdf_path, ocr_needed, max_workers=self.ocr_workers, document=document
+                        )
+                        for page_num, ocr_text in ocr_texts.items():
+                            page_texts[page_num - 1] = ocr_text
             
-            full_text = "\n\n".join(text_content)
+            for page_num, page_text in enumerate(page_texts, 1):
+                if page_text:
+                    text_content.append(page_text)
+                    pages_metadata.append({
+                        "page": page_num,
+                        "char_count": len(page_text),
+                        "word_count": _count_words(page_text),
+                        "has_text": True
+                    })
+                else:
+                    pages_metadata.append({
+                        "page": page_num,
+                        "char_count": 0,
+                        "word_count": 0,
+                        "has_text": False
+                    })
             
-            # Chunk the document with page references
-            chunks = self.chunker.chunk_with_pages(full_text, pages_metadata)
+            # Chunk the document with page references, straight from the page texts
+            chunks = list(self.chunker.chunk_with_pages_stream(
+                (page_num, page_text) for page_num, page_text in enumerate(page_texts, 1) if page_text
+            ))
+            
+            full_text = "\n\n".join(text_content)
             
             return {
                 "text": full_text,
@@ -143,16 +270,67 @@ class ReaderAgent:
                     "source_type": "pdf",
                     "total_pages": total_pages,
                     "total_chars": len(full_text),
-                    "total_words": len(full_text.split()),
+                    # Pages are joined with whitespace, so their word counts add up exactly
+                    "total_words": sum(page["word_count"] for page in pages_metadata),
                     "pages": pages_metadata
                 },
                 "chunks": chunks
             }
-            
+        
         except Exception as e:
             logger.error(f"Error reading PDF {pdf_path}: {e}")
             raise
     
+    def _extract_pages_pdfium(self, document) -> List[str]:
+        """
+        Extract page texts with PDFium, which is several times faster than
+        pdfplumber's pure-Python layout analysis
+        
+        Args:
+            document: PdfDocument from open_pdf
+        
+        Returns:
+            Page texts in page order
+        """
+        page_texts = []
+        for page in document:
+            textpage = page.get_textpage()
+            # PDFium ends lines with \r\n
+            page_texts.append(textpage.get_text_range().replace("\r\n", "\n"))
+            textpage.close()
+            page.close()
+        return page_texts
+    
+    def _extract_pages_parallel(self, pdf_path: str, total_pages: int) -> List[Optional[str]]:
+        """
+        Extract page texts in worker processes, one contiguous page range per task
+        
+        Args:
+            pdf_path: Path to PDF file
+            total_pages: Number of pages in the PDF
+        
+        Returns:
+            Page texts in page order
+        """
+        workers = min(self.pdf_workers, total_pages)
+        # A few ranges per worker keeps the load balanced without reopening the PDF per page
+        range_size = max(1, -(-total_pages // (workers * 4)))
+        ranges = [
+            list(range(start, min(start + range_size, total_pages + 1)))
+            for start in range(1, total_pages + 1, range_size)
+        ]
+        
+        try:
+            with ProcessPoolExecutor(max_workers=workers) as executor:
+                results = executor.map(_extract_page_texts, [pdf_path] * len(ranges), ranges)
+                return [text for range_texts in results for text in range_texts]
+        except Exception as e:
+            logger.warning(f"Parallel PDF extraction failed ({e}); extracting sequentially")
+            import pdfplumber
+            
+            with pdfplumber.open(pdf_path) as pdf:
+                return [page.extract_text() for page in pdf.pages]
+    
     def _read_text(self, text_path: str) -> Dict:
         """Read text file"""
         try:
@@ -168,7 +346,7 @@ class ReaderAgent:
                     "source": text_path,
                     "source_type": "text",
                     "total_chars": len(text),
-                    "total_words": len(text.split()),
+                    "total_words": _count_words(text),
                     "lines": text.count("\n")
                 },
                 "chunks": chunks
@@ -179,21 +357,22 @@ class ReaderAgent:
     
     def _read_url(self, url: str) -> Dict:
         """Read content from URL"""
+        return self._document_from_html(url, self._fetch_url(url))
+    
+    def _fetch_url(self, url: str) -> bytes:
+        """Download a web page over the shared keep-alive session"""
         try:
-            headers = {
-                "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36"
-            }
-            response = requests.get(url, headers=headers, timeout=30)
+            response = self._session.get(url, timeout=30)
             response.raise_for_status()
-            
-            soup = BeautifulSoup(response.content, "html.parser")
-            
-            # Remove script and style elements
-            for script in soup(["script", "style"]):
-                script.decompose()
-            
-            # Extract text
-            text = soup.get_text()
+            return response.content
+        except Exception as e:
+            logger.error(f"Error reading URL {url}: {e}")
+            raise
+    
+    def _document_from_html(self, url: str, content: bytes) -> Dict:
+        """Build the document dictionary for a downloaded web page"""
+        try:
+            text, title = self._parse_html(content)
             
             # Clean up whitespace
             lines = (line.strip() for line in text.splitlines())
@@ -209,8 +388,8 @@ class ReaderAgent:
                     "source": url,
                     "source_type": "url",
                     "total_chars": len(text),
-                    "total_words": len(text.split()),
-                    "title": soup.title.string if soup.title else None
+                    "total_words": _count_words(text),
+                    "title": title
                 },
                 "chunks": chunks
             }
@@ -218,8 +397,47 @@ class ReaderAgent:
             logger.error(f"Error reading URL {url}: {e}")
             raise
     
+    def _parse_html(self, content: bytes) -> Tuple[str, Optional[str]]:
+        """
+        Extract the visible text and title of an HTML page
+        
+        Uses selectolax's lexbor parser when installed, BeautifulSoup otherwise.
+        
+        Args:
+            content: Raw HTML
+        
+        Returns:
+            Tuple of (text, title)
+        """
+        try:
+            from selectolax.lexbor import LexborHTMLParser
+        except ImportError:
+            LexborHTMLParser = None
+        
+        if LexborHTMLParser is not None:
+            tree = LexborHTMLParser(content)
+            # Remove script and style elements
+            for node in tree.css("script, style"):
+                node.decompose()
+            title_node = tree.css_first("title")
+            root = tree.body or tree.root
+            text = root.text(separator="", strip=False) if root is not None else ""
+            return text, title_node.text() if title_node is not None else None
+        
+        from bs4 import BeautifulSoup
+        
+        soup = BeautifulSoup(content, _HTML_PARSER)
+        
+        # Remove script and style elements
+        for script in soup(["script", "style"]):
+            script.decompose()
+        
+        return soup.get_text(), soup.title.string if soup.title else None
+    
     def extract_tables_from_pdf(self, pdf_path: str) -> List[Dict]:
         """Extract tables from PDF"""
+        import pdfplumber
+        
         tables = []
         try:
             with pdfplumber.open(pdf_path) as pdf:
@@ -3,34 +3,15 @@ Command Line Interface for DocuMind
 """
 
 import argparse
+import functools
 import os
 import sys
 from pathlib import Path
+from typing import Optional
 
-from .orchestrator import DocuMind
 
-
-def main():
-    """Main CLI entry point"""
-    parser = argparse.ArgumentParser(
-        description="DocuMind - AI Document Intelligence Agent",
-        formatter_class=argparse.RawDescriptionHelpFormatter,
-        epilog="""
-Examples:
-  # Process a document with extraction and summarization
-  python -m documind.cli process document.pdf --tasks extract summarize
-  
-  # Ask a question about a document
-  python -m documind.cli qa document.pdf "What are the key findings?"
-  
-  # Generate executive summary
-  python -m documind.cli summarize document.pdf --type executive
-        """
-    )
-    
-    subparsers = parser.add_subparsers(dest='command', help='Available commands')
-    
-    # Process command
+def _add_process_parser(subparsers):
+    """Add the process command"""
     process_parser = subparsers.add_parser('process', help='Process a document')
     process_parser.add_argument('source', help='Path to document or URL')
     process_parser.add_argument('--tasks', nargs='+', 
@@ -42,21 +23,75 @@ Examples:
                               help='Disable memory storage')
     process_parser.add_argument('--no-evaluation', action='store_true',
                               help='Disable evaluation')
-    
-    # Q&A command
+
+
+def _add_qa_parser(subparsers):
+    """Add the Q&A command"""
     qa_parser = subparsers.add_parser('qa', help='Answer questions about a document')
     qa_parser.add_argument('source', help='Path to document')
     qa_parser.add_argument('question', help='Question to ask')
     qa_parser.add_argument('--api-key', help='OpenAI API key')
-    
-    # Summarize command
+
+
+def _add_summarize_parser(subparsers):
+    """Add the summarize command"""
     summarize_parser = subparsers.add_parser('summarize', help='Generate summary')
     summarize_parser.add_argument('source', help='Path to document')
     summarize_parser.add_argument('--type', choices=['executive', 'bullet', 'tldr'],
                                  default='executive', help='Summary type')
     summarize_parser.add_argument('--api-key', help='OpenAI API key')
+
+
+_SUBCOMMANDS = {
+    'process': _add_process_parser,
+    'qa': _add_qa_parser,
+    'summarize': _add_summarize_parser,
+}
+
+
+@functools.lru_cache(maxsize=None)
+def _build_parser(command: Optional[str] = None) -> argparse.ArgumentParser:
+    """
+    Build the argument parser
+    
+    Args:
+        command: Build only this subcommand's parser (all of them if None, e.g. for --help)
+    
+    Returns:
+        Argument parser
+    """
+    parser = argparse.ArgumentParser(
+        description="DocuMind - AI Document Intelligence Agent",
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog="""
+Examples:
+  # Process a document with extraction and summarization
+  python -m documind.cli process document.pdf --tasks extract summarize
+  
+  # Ask a question about a document
+  python -m documind.cli qa document.pdf "What are the key findings?"
+  
+  # Generate executive summary
+  python -m documind.cli summarize document.pdf --type executive
+        """
+    )
+    
+    subparsers = parser.add_subparsers(dest='command', help='Available commands')
+    for name, add_parser in _SUBCOMMANDS.items():
+        if command is None or name == command:
+            add_parser(subparsers)
     
-    args = parser.parse_args()
+    return parser
+
+
+def main():
+    """Main CLI entry point"""
+    argv = sys.argv[1:]
+    # The common case names a subcommand first; only that one's parser is built
+    command = argv[0] if argv and argv[0] in _SUBCOMMANDS else None
+    parser = _build_parser(command)
+    
+    args = parser.parse_args(argv)
     
     if not args.command:
         parser.print_help()
@@ -68,6 +103,9 @@ Examples:
         print("Error: OpenAI API key required. Set OPENAI_API_KEY environment variable or use --api-key")
         sys.exit(1)
     
+    # Imported only once a command runs, so --help does not load the models' dependencies
+    from .orchestrator import DocuMind
+    
     # Initialize DocuMind
     dm = DocuMind(
         api_key=api_key,
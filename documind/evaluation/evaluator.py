@@ -8,6 +8,9 @@ from loguru import logger
 from .metrics import EvaluationMetrics
 
 
+_EXTRACTION_TYPES = ("tables", "metrics", "dates", "tasks", "entities")
+
+
 class Evaluator:
     """
     Evaluator Agent assesses the quality of generated outputs:
@@ -77,30 +80,25 @@ class Evaluator:
         Returns:
             Evaluation results
         """
-        evaluation = {
-            "tables": {"count": 0, "quality": 0.0},
-            "metrics": {"count": 0, "quality": 0.0},
-            "dates": {"count": 0, "quality": 0.0},
-            "tasks": {"count": 0, "quality": 0.0},
-            "entities": {"count": 0, "quality": 0.0},
-            "overall_score": 0.0
-        }
+        evaluation = {}
+        total_quality = 0.0
         
-        # Evaluate each extraction type
-        for ext_type in ["tables", "metrics", "dates", "tasks", "entities"]:
+        # Evaluate each extraction type, summing quality in the same pass
+        for ext_type in _EXTRACTION_TYPES:
             ext_data = extractions.get(ext_type, [])
             if isinstance(ext_data, dict):
                 ext_data = ext_data.get("all", [])
             
-            evaluation[ext_type]["count"] = len(ext_data) if isinstance(ext_data, list) else 0
-            
             # Simple quality heuristic (can be improved)
-            if ext_data:
-                evaluation[ext_type]["quality"] = min(1.0, len(ext_data) / 10.0)  # Normalize
+            quality = min(1.0, len(ext_data) / 10.0) if ext_data else 0.0  # Normalize
+            total_quality += quality
+            evaluation[ext_type] = {
+                "count": len(ext_data) if isinstance(ext_data, list) else 0,
+                "quality": quality
+            }
         
         # Calculate overall score
-        scores = [evaluation[ext_type]["quality"] for ext_type in evaluation if ext_type != "overall_score"]
-        evaluation["overall_score"] = sum(scores) / len(scores) if scores else 0.0
+        evaluation["overall_score"] = total_quality / len(_EXTRACTION_TYPES)
         
         return evaluation
     
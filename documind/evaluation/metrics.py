@@ -2,17 +2,49 @@
 Evaluation Metrics - ROUGE, clarity, completeness scoring
 """
 
-from typing import Dict, List, Optional
-from rouge_score import rouge_scorer
+from typing import Dict, List, Optional, Tuple
+import functools
+import re
 from loguru import logger
-import nltk
 
-# Download required NLTK data
-try:
-    nltk.download('punkt', quiet=True)
-    nltk.download('stopwords', quiet=True)
-except:
-    pass
+
+# Sentence boundaries for the clarity heuristic: end punctuation, whitespace, capital letter
+_SENT_SPLIT = re.compile(r'(?<=[.!?])\s+(?=[A-Z])')
+
+
+_ROUGE_TYPES = ('rouge1', 'rouge2', 'rougeL')
+
+
+def _uniform_rouge(value: float) -> Dict:
+    """ROUGE result with the same precision, recall and F-measure for every type"""
+    return {
+        rouge_type: {"precision": value, "recall": value, "fmeasure": value}
+        for rouge_type in _ROUGE_TYPES
+    }
+
+
+def _token_set(text: str) -> frozenset:
+    """Lowercased whitespace tokens of a text"""
+    return frozenset(text.lower().split())
+
+
+class _CachingTokenizer:
+    """
+    ROUGE tokenizer that memoizes stemmed tokens per text, so a reference
+    scored against many summaries is tokenized and stemmed only once
+    """
+    
+    def __init__(self, use_stemmer: bool = True, maxsize: int = 128):
+        from rouge_score import tokenizers
+        
+        self._tokenizer = tokenizers.DefaultTokenizer(use_stemmer=use_stemmer)
+        self._tokenize = functools.lru_cache(maxsize=maxsize)(self._tokenize_uncached)
+    
+    def _tokenize_uncached(self, text: str) -> Tuple[str, ...]:
+        return tuple(self._tokenizer.tokenize(text))
+    
+    def tokenize(self, text: str) -> Tuple[str, ...]:
+        return self._tokenize(text)
 
 
 class EvaluationMetrics:
@@ -20,7 +52,16 @@ class EvaluationMetrics:
     
     def __init__(self):
         """Initialize evaluation metrics"""
-        self.rouge_scorer = rouge_scorer.RougeScorer(['rouge1', 'rouge2', 'rougeL'], use_stemmer=True)
+        # rouge_score pulls in NLTK and absl, so it is imported on first use
+        from rouge_score import rouge_scorer
+        
+        self._tokenizer = _CachingTokenizer(use_stemmer=True)
+        self.rouge_scorer = rouge_scorer.RougeScorer(list(_ROUGE_TYPES), tokenizer=self._tokenizer)
+        # Token sets of recent texts, so a document evaluated repeatedly is split once;
+        # kept small and per instance, as the keys are whole documents
+        self._token_set = functools.lru_cache(maxsize=8)(_token_set)
+        # (pages metadata list, its length, its valid page numbers) of the last document checked for citations
+        self._valid_pages_cache = (None, 0, frozenset())
     
     def calculate_rouge(self, summary: str, reference: str) -> Dict:
         """
@@ -33,7 +74,15 @@ class EvaluationMetrics:
         Returns:
             Dictionary with ROUGE scores
         """
+        # Nothing to match against: every score is zero
+        if not summary.strip() or not reference.strip():
+            return _uniform_rouge(0.0)
+        
         try:
+            # Identical texts match perfectly, as long as they have a bigram for ROUGE-2
+            if summary == reference and len(self._tokenizer.tokenize(summary)) >= 2:
+                return _uniform_rouge(1.0)
+            
             scores = self.rouge_scorer.score(reference, summary)
             return {
                 "rouge1": {
@@ -70,20 +119,33 @@ class EvaluationMetrics:
         if not text:
             return 0.0
         
-        sentences = nltk.sent_tokenize(text)
-        if not sentences:
+        sentences = _SENT_SPLIT.split(text.strip())
+        
+        # Word counts, very long and very short sentences in one pass
+        total_words = 0
+        num_sentences = 0
+        long_sentences = 0
+        short_sentences = 0
+        for sentence in sentences:
+            words = len(sentence.split())
+            total_words += words
+            num_sentences += 1
+            long_sentences += words > 40
+            short_sentences += words < 3
+        
+        if not num_sentences or not total_words:
             return 0.0
         
         # Average sentence length (optimal around 15-20 words)
-        avg_sentence_length = sum(len(s.split()) for s in sentences) / len(sentences)
+        avg_sentence_length = total_words / num_sentences
         length_score = 1.0 - abs(avg_sentence_length - 17.5) / 17.5
         length_score = max(0.0, min(1.0, length_score))
         
         # Check for common clarity issues
         issues = 0
-        if any(len(s.split()) > 40 for s in sentences):  # Very long sentences
+        if long_sentences:  # Very long sentences
             issues += 1
-        if any(len(s.split()) < 3 for s in sentences):  # Very short sentences
+        if short_sentences:  # Very short sentences
             issues += 1
         
         issue_penalty = issues * 0.1
@@ -107,8 +169,8 @@ class EvaluationMetrics:
             return 0.0
         
         # Simple approach: check coverage of important terms
-        original_words = set(original.lower().split())
-        summary_words = set(summary.lower().split())
+        original_words = self._token_set(original)
+        summary_words = self._token_set(summary)
         
         # Calculate overlap
         if not original_words:
@@ -119,7 +181,8 @@ class EvaluationMetrics:
         
         # Boost score if key topics are present
         if key_topics:
-            topics_covered = sum(1 for topic in key_topics if topic.lower() in summary.lower())
+            summary_lower = summary.lower()
+            topics_covered = sum(1 for topic in key_topics if topic.lower() in summary_lower)
             topic_bonus = topics_covered / len(key_topics) * 0.2
             coverage = min(1.0, coverage + topic_bonus)
         
@@ -129,6 +192,9 @@ class EvaluationMetrics:
         """
         Calculate citation accuracy (0-1)
         
+        The valid page set is cached per pages list; edit a page entry in place
+        and the next call may not see it, so pass a new list instead.
+        
         Args:
             citations: List of citations
             document: Document dictionary with page information
@@ -141,7 +207,13 @@ class EvaluationMetrics:
         
         # Check if cited pages exist in document
         pages_metadata = document.get("metadata", {}).get("pages", [])
-        valid_pages = {page["page"] for page in pages_metadata if page.get("has_text", False)}
+        # Q&A evaluations cite the same document over and over; reuse its page set
+        # while it is the same list at the same length. Pages appended or removed are
+        # picked up, but page entries edited in place are not: replace the list instead
+        cached_pages, cached_count, valid_pages = self._valid_pages_cache
+        if cached_pages is not pages_metadata or cached_count != len(pages_metadata):
+            valid_pages = frozenset(page["page"] for page in pages_metadata if page.get("has_text", False))
+            self._valid_pages_cache = (pages_metadata, len(pages_metadata), valid_pages)
         
         if not valid_pages:
             return 0.5  # Can't verify, give neutral score
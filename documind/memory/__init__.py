@@ -2,6 +2,7 @@
 
 from .memory_bank import MemoryBank
 from .session_memory import SessionMemory
+from .summary_cache import SummaryCache
 
-__all__ = ["MemoryBank", "SessionMemory"]
+__all__ = ["MemoryBank", "SessionMemory", "SummaryCache"]
 
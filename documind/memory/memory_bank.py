@@ -2,6 +2,7 @@
 Memory Bank - Long-term memory storage for insights
 """
 
+import bisect
 import json
 import os
 from typing import Dict, List, Optional
@@ -10,43 +11,144 @@ from pathlib import Path
 from loguru import logger
 import hashlib
 
+try:
+    import orjson
+except ImportError:  # Optional: falls back to the stdlib json module
+    orjson = None
+
+
+def _dumps(obj, indent: bool = False) -> bytes:
+    """Serialize to UTF-8 JSON bytes, with orjson when installed"""
+    if orjson is not None:
+        option = orjson.OPT_NON_STR_KEYS | (orjson.OPT_INDENT_2 if indent else 0)
+        return orjson.dumps(obj, option=option)
+    return json.dumps(obj, indent=2 if indent else None, ensure_ascii=False).encode("utf-8")
+
+
+def _loads(data: bytes):
+    """Parse JSON bytes, with orjson when installed"""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
 
 class MemoryBank:
     """
     Memory Bank stores extracted insights for long-term persistence
     across multiple sessions
+    
+    memory.json holds a snapshot of all documents; each change since the
+    snapshot is appended to memory.jsonl, so an update writes only the changed
+    entry. The log is folded into the snapshot once it grows long.
     """
     
-    def __init__(self, storage_path: str = "./memory_bank"):
+    def __init__(self, storage_path: str = "./memory_bank", max_log_entries: int = 1000):
         """
         Initialize Memory Bank
         
         Args:
             storage_path: Path to store memory files
+            max_log_entries: Logged changes after which the snapshot is rewritten
         """
         self.storage_path = Path(storage_path)
         self.storage_path.mkdir(parents=True, exist_ok=True)
         self.memory_file = self.storage_path / "memory.json"
+        self.log_file = self.storage_path / "memory.jsonl"
+        self.max_log_entries = max_log_entries
+        self._log_entries = 0
+        self._log_damaged = False
         self.memory = self._load_memory()
+        if self._log_damaged:
+            # Fold what was readable into the snapshot so new entries are not appended after a partial line
+            self._save_memory()
+        # Lowercased serialized insights per document, built on first search and
+        # dropped whenever the document's insights change
+        self._search_index: Dict[str, str] = {}
+        # All of the above joined into one string (NUL-separated, which JSON
+        # never emits) with each document's start and end offsets, so a search is a
+        # few C-level find() calls instead of a Python loop over documents
+        self._search_blob: Optional[str] = None
+        self._search_starts: List[int] = []
+        self._search_ends: List[int] = []
+        self._search_longest = 0
+        self._search_ids: List[str] = []
     
     def _load_memory(self) -> Dict:
-        """Load memory from disk"""
+        """Load the memory snapshot from disk and replay the change log over it"""
+        memory = {}
         if self.memory_file.exists():
             try:
-                with open(self.memory_file, "r", encoding="utf-8") as f:
-                    return json.load(f)
+                memory = _loads(self.memory_file.read_bytes())
             except Exception as e:
                 logger.error(f"Error loading memory: {e}")
                 return {}
-        return {}
+        
+        if self.log_file.exists():
+            try:
+                with open(self.log_file, "rb") as f:
+                    for line in f:
+                        try:
+                            record = _loads(line)
+                        except ValueError:
+                            # A write cut short by a crash leaves a partial last line
+                            logger.warning("Skipping unreadable memory log entry")
+                            self._log_damaged = True
+                            continue
+                        if record.get("op") == "put":
+                            memory[record["id"]] = record["data"]
+                        elif record.get("op") == "delete":
+                            memory.pop(record["id"], None)
+                        elif record.get("op") == "touch":
+                            if record["id"] in memory:
+                                memory[record["id"]]["updated_at"] = record["updated_at"]
+                        self._log_entries += 1
+            except Exception as e:
+                logger.error(f"Error replaying memory log: {e}")
+        return memory
+    
+    def _append_log(self, record: Dict, sync: bool = True):
+        """
+        Append one change to the log, compacting it once it grows long
+        
+        Args:
+            record: Log record
+            sync: fsync the log so the change survives a crash
+        """
+        try:
+            with open(self.log_file, "ab") as f:
+                f.write(_dumps(record) + b"\n")
+                if sync:
+                    f.flush()
+                    os.fsync(f.fileno())
+            self._log_entries += 1
+        except Exception as e:
+            logger.error(f"Error saving memory: {e}")
+            return
+        
+        if self._log_entries >= self.max_log_entries:
+            self._save_memory()
     
     def _save_memory(self):
-        """Save memory to disk"""
+        """Atomically write the full snapshot to disk and clear the change log"""
+        tmp_file = self.memory_file.with_suffix(f".{os.getpid()}.tmp")
         try:
-            with open(self.memory_file, "w", encoding="utf-8") as f:
-                json.dump(self.memory, f, indent=2, ensure_ascii=False)
+            with open(tmp_file, "wb") as f:
+                # Compact: the snapshot is machine-read; use export() for a readable copy
+                f.write(_dumps(self.memory))
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp_file, self.memory_file)
+            # Replaying the log again over the new snapshot would be harmless, so a
+            # crash before this truncation loses nothing
+            with open(self.log_file, "wb"):
+                pass
+            self._log_entries = 0
         except Exception as e:
             logger.error(f"Error saving memory: {e}")
+            try:
+                tmp_file.unlink()
+            except OSError:
+                pass
     
     def store_insights(self, document_id: str, insights: Dict, metadata: Optional[Dict] = None):
         """
@@ -57,24 +159,49 @@ class MemoryBank:
             insights: Extracted insights dictionary
             metadata: Optional metadata about the document
         """
-        if document_id not in self.memory:
-            self.memory[document_id] = {
+        now = datetime.now().isoformat()
+        entry = self.memory.get(document_id)
+        if entry is not None and self._is_unchanged(entry, insights, metadata):
+            # Re-ingesting identical insights: log only the new timestamp, without an
+            # fsync, so compact_memory still sees the document as recently used
+            entry["updated_at"] = now
+            self._append_log({"op": "touch", "id": document_id, "updated_at": now}, sync=False)
+            logger.debug(f"Insights unchanged for document: {document_id}")
+            return
+        
+        if entry is None:
+            entry = self.memory[document_id] = {
                 "insights": {},
                 "metadata": metadata or {},
-                "created_at": datetime.now().isoformat(),
-                "updated_at": datetime.now().isoformat()
+                "created_at": now,
+                "updated_at": now
             }
         
         # Store insights
-        self.memory[document_id]["insights"] = insights
-        self.memory[document_id]["updated_at"] = datetime.now().isoformat()
+        entry["insights"] = insights
+        entry["updated_at"] = now
         
         if metadata:
-            self.memory[document_id]["metadata"].update(metadata)
+            entry["metadata"].update(metadata)
+        
+        self._invalidate_search(document_id)
         
-        self._save_memory()
+        self._append_log({"op": "put", "id": document_id, "data": entry})
         logger.info(f"Stored insights for document: {document_id}")
     
+    @staticmethod
+    def _is_unchanged(entry: Dict, insights: Dict, metadata: Optional[Dict]) -> bool:
+        """Whether storing insights and metadata would leave an entry's persisted content as it is"""
+        # The stored objects themselves may have been edited in place since they were
+        # last written, so passing them back in always counts as a change
+        if insights is entry["insights"] or (metadata is not None and metadata is entry["metadata"]):
+            return False
+        if insights != entry["insights"]:
+            return False
+        return not metadata or all(
+            key in entry["metadata"] and entry["metadata"][key] == value for key, value in metadata.items()
+        )
+    
     def retrieve_insights(self, document_id: str) -> Optional[Dict]:
         """
         Retrieve stored insights for a document
@@ -98,26 +225,142 @@ class MemoryBank:
         Returns:
             List of matching insights
         """
-        results = []
         query_lower = query.lower()
+        blob = self._build_search_blob()
         
-        for doc_id, data in self.memory.items():
-            insights = data.get("insights", {})
-            
-            # Simple text search
-            insights_str = json.dumps(insights).lower()
-            if query_lower in insights_str:
-                results.append({
-                    "document_id": doc_id,
-                    "insights": insights,
-                    "metadata": data.get("metadata", {}),
-                    "relevance": insights_str.count(query_lower)  # Simple relevance score
-                })
+        # find() skips straight to the next document containing the query, which
+        # is then counted within its own span and the scan resumes after it
+        counts: Dict[int, int] = {}
+        if not query_lower:
+            for position, doc_id in enumerate(self._search_ids):
+                counts[position] = len(self._search_index[doc_id]) + 1
+        elif "\0" not in query_lower and len(query_lower) <= self._search_longest:
+            starts = self._search_starts
+            ends = self._search_ends
+            find = blob.find
+            count = blob.count
+            bisect_right = bisect.bisect_right
+            pos = find(query_lower)
+            while pos != -1:
+                position = bisect_right(starts, pos) - 1
+                end = ends[position]
+                counts[position] = count(query_lower, starts[position], end)
+                pos = find(query_lower, end)
+        
+        return self._search_results(counts, limit)
+    
+    def search_many(self, queries: List[str], limit: int = 10) -> Dict[str, List[Dict]]:
+        """
+        Search for several queries at once
+        
+        With pyahocorasick installed, all queries are located in one pass over
+        the stored insights instead of one pass per query.
+        
+        Args:
+            queries: Search queries
+            limit: Maximum number of results per query
+        
+        Returns:
+            Results for each query, as search_insights would return them
+        """
+        try:
+            import ahocorasick
+        except ImportError:
+            ahocorasick = None
+        
+        # Queries the automaton cannot express (empty or containing the separator) are searched singly
+        terms = {query.lower() for query in queries if query and "\0" not in query}
+        if ahocorasick is None or not terms:
+            return {query: self.search_insights(query, limit) for query in queries}
+        
+        blob = self._build_search_blob()
+        automaton = ahocorasick.Automaton()
+        for term in terms:
+            automaton.add_word(term, term)
+        automaton.make_automaton()
+        
+        # Hits arrive in order of end offset; skipping those that overlap the
+        # term's previous counted hit gives str.count's non-overlapping tally
+        starts = self._search_starts
+        bisect_right = bisect.bisect_right
+        counts: Dict[str, Dict[int, int]] = {term: {} for term in terms}
+        last_end: Dict[str, int] = {}
+        for end, term in automaton.iter(blob):
+            start = end - len(term) + 1
+            if start < last_end.get(term, 0):
+                continue
+            last_end[term] = end + 1
+            term_counts = counts[term]
+            position = bisect_right(starts, start) - 1
+            term_counts[position] = term_counts.get(position, 0) + 1
+        
+        return {
+            query: self._search_results(counts[query.lower()], limit)
+            if query and "\0" not in query else self.search_insights(query, limit)
+            for query in queries
+        }
+    
+    def _search_results(self, counts: Dict[int, int], limit: int) -> List[Dict]:
+        """Build search results from hit counts per document position, most relevant first"""
+        results = []
+        for position in sorted(counts):
+            doc_id = self._search_ids[position]
+            data = self.memory[doc_id]
+            results.append({
+                "document_id": doc_id,
+                "insights": data.get("insights", {}),
+                "metadata": data.get("metadata", {}),
+                "relevance": counts[position]  # Simple relevance score
+            })
         
         # Sort by relevance
         results.sort(key=lambda x: x["relevance"], reverse=True)
         return results[:limit]
     
+    def _build_search_blob(self) -> str:
+        """Join the per-document search strings into one blob, rebuilding only after a change"""
+        if self._search_blob is not None:
+            return self._search_blob
+        
+        parts = []
+        starts = []
+        ends = []
+        offset = 0
+        for doc_id, data in self.memory.items():
+            insights_str = self._search_index.get(doc_id)
+            if insights_str is None:
+                insights_str = _dumps(data.get("insights", {})).decode("utf-8").lower()
+                self._search_index[doc_id] = insights_str
+            starts.append(offset)
+            parts.append(insights_str)
+            offset += len(insights_str)
+            ends.append(offset)
+            offset += 1
+        
+        self._search_blob = "\0".join(parts)
+        self._search_starts = starts
+        self._search_ends = ends
+        self._search_longest = max((len(part) for part in parts), default=0)
+        self._search_ids = list(self.memory)
+        return self._search_blob
+    
+    def _invalidate_search(self, document_id: str):
+        """Drop a document's search string and the joined blob"""
+        self._search_index.pop(document_id, None)
+        self._search_blob = None
+    
+    def export(self, path: str, pretty: bool = True):
+        """
+        Write all stored insights to a single JSON file
+        
+        Args:
+            path: Output file path
+            pretty: Indent the JSON for human inspection
+        """
+        with open(path, "wb") as f:
+            f.write(_dumps(self.memory, indent=pretty))
+        logger.info(f"Exported {len(self.memory)} documents to {path}")
+    
     def get_all_documents(self) -> List[str]:
         """Get list of all document IDs in memory"""
         return list(self.memory.keys())
@@ -126,12 +369,14 @@ class MemoryBank:
         """Delete insights for a document"""
         if document_id in self.memory:
             del self.memory[document_id]
-            self._save_memory()
+            self._invalidate_search(document_id)
+            self._append_log({"op": "delete", "id": document_id})
             logger.info(f"Deleted insights for document: {document_id}")
     
     def compact_memory(self, max_age_days: int = 90):
         """
-        Compact memory by removing old entries
+        Compact memory by removing old entries and folding the change log
+        into the snapshot
         
         Args:
             max_age_days: Maximum age in days before removal
@@ -141,14 +386,17 @@ class MemoryBank:
         
         to_remove = []
         for doc_id, data in self.memory.items():
-            updated_at = datetime.fromisoformat(data.get("updated_at", datetime.now().isoformat()))
-            if updated_at < cutoff_date:
+            # Entries without a timestamp count as fresh
+            updated_at = data.get("updated_at")
+            if updated_at and datetime.fromisoformat(updated_at) < cutoff_date:
                 to_remove.append(doc_id)
         
         for doc_id in to_remove:
             del self.memory[doc_id]
+            self._invalidate_search(doc_id)
         
-        if to_remove:
+        if to_remove or self._log_entries:
             self._save_memory()
+        if to_remove:
             logger.info(f"Compacted memory: removed {len(to_remove)} old entries")
 
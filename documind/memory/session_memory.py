@@ -38,15 +38,11 @@ class SessionMemory:
     
     def store_extractions(self, document_id: str, extractions: Dict):
         """Store extractions for a document"""
-        if document_id not in self.context["extractions"]:
-            self.context["extractions"][document_id] = {}
-        self.context["extractions"][document_id].update(extractions)
+        self.context["extractions"].setdefault(document_id, {}).update(extractions)
     
     def store_summaries(self, document_id: str, summaries: Dict):
         """Store summaries for a document"""
-        if document_id not in self.context["summaries"]:
-            self.context["summaries"][document_id] = {}
-        self.context["summaries"][document_id].update(summaries)
+        self.context["summaries"].setdefault(document_id, {}).update(summaries)
     
     def add_qa_pair(self, question: str, answer: Dict):
         """Add Q&A pair to history"""
@@ -0,0 +1,122 @@
+"""
+Summary Cache - Disk-backed LRU + TTL cache for generated summaries
+"""
+
+import json
+import os
+import time
+from typing import Dict, Optional
+from pathlib import Path
+from loguru import logger
+import hashlib
+
+
+class SummaryCache:
+    """
+    Summary Cache stores generated summaries on disk, keyed by a hash of the
+    document text, model and instructions, so re-processing the same document
+    skips the model entirely
+    """
+    
+    def __init__(self, cache_path: str = "./.documind_cache", max_entries: int = 256, ttl_seconds: int = 86400):
+        """
+        Initialize Summary Cache
+        
+        Args:
+            cache_path: Directory holding one JSON file per cached entry
+            max_entries: Entries kept before the least recently used are evicted
+            ttl_seconds: Age after which an entry is treated as missing
+        """
+        self.cache_path = Path(cache_path)
+        self.cache_path.mkdir(parents=True, exist_ok=True)
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+    
+    @staticmethod
+    def make_key(text: str, model_name: str, instructions: Optional[Dict] = None) -> str:
+        """Build the cache key for a document text, model and instructions"""
+        digest = hashlib.sha256()
+        digest.update(text.encode("utf-8", errors="surrogatepass"))
+        digest.update(b"\0" + model_name.encode("utf-8"))
+        digest.update(b"\0" + json.dumps(instructions or {}, sort_keys=True).encode("utf-8"))
+        return digest.hexdigest()
+    
+    def get(self, key: str) -> Optional[Dict]:
+        """
+        Get a cached entry
+        
+        Args:
+            key: Cache key from make_key
+        
+        Returns:
+            Cached value, or None if missing or expired
+        """
+        entry_file = self.cache_path / f"{key}.json"
+        try:
+            with open(entry_file, "r", encoding="utf-8") as f:
+                entry = json.load(f)
+        except FileNotFoundError:
+            return None
+        except Exception as e:
+            logger.error(f"Error reading summary cache entry: {e}")
+            return None
+        
+        if time.time() - entry.get("created_at", 0) > self.ttl_seconds:
+            self._remove(entry_file)
+            return None
+        
+        # Refresh the modification time so eviction sees this entry as recently used
+        try:
+            os.utime(entry_file)
+        except OSError:
+            pass
+        return entry.get("value")
+    
+    def set(self, key: str, value: Dict):
+        """
+        Store an entry, evicting the least recently used ones beyond max_entries
+        
+        Args:
+            key: Cache key from make_key
+            value: JSON-serializable value
+        """
+        entry_file = self.cache_path / f"{key}.json"
+        tmp_file = entry_file.with_suffix(f".{os.getpid()}.tmp")
+        try:
+            with open(tmp_file, "w", encoding="utf-8") as f:
+                json.dump({"created_at": time.time(), "value": value}, f, ensure_ascii=False)
+            os.replace(tmp_file, entry_file)
+        except Exception as e:
+            logger.error(f"Error writing summary cache entry: {e}")
+            self._remove(tmp_file)
+            return
+        
+        self._evict()
+    
+    def clear(self):
+        """Remove every cached entry"""
+        for entry_file in self.cache_path.glob("*.json"):
+            self._remove(entry_file)
+    
+    def _evict(self):
+        """Drop the least recently used entries beyond max_entries"""
+        entries = []
+        for entry_file in self.cache_path.glob("*.json"):
+            try:
+                entries.append((entry_file.stat().st_mtime, entry_file))
+            except OSError:
+                continue
+        
+        if len(entries) <= self.max_entries:
+            return
+        
+        entries.sort()
+        for _, entry_file in entries[:len(entries) - self.max_entries]:
+            self._remove(entry_file)
+    
+    def _remove(self, entry_file: Path):
+        """Remove a cache file, ignoring files already gone"""
+        try:
+            entry_file.unlink()
+        except OSError:
+            pass
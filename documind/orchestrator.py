@@ -3,19 +3,13 @@ DocuMind Orchestrator - Main coordinator for all agents
 """
 
 import os
-from typing import Dict, List, Optional, Any
+import functools
+from typing import Dict, Iterator, List, Optional, Any
 from pathlib import Path
 import hashlib
 from loguru import logger
 from datetime import datetime
 
-from .agents.reader import ReaderAgent
-from .agents.extractor import ExtractorAgent
-from .agents.analyzer import AnalyzerAgent
-from .agents.qa_agent import QAAgent
-from .agents.memory import MemoryAgent
-from .agents.evaluator import EvaluatorAgent
-
 
 class DocuMind:
     """
@@ -29,7 +23,9 @@ class DocuMind:
         memory_enabled: bool = True,
         evaluation_enabled: bool = True,
         storage_path: str = "./memory_bank",
-        use_free_models: bool = True
+        use_free_models: bool = True,
+        embedding_batch_size: int = 64,
+        ocr_workers: Optional[int] = None
     ):
         """
         Initialize DocuMind
@@ -41,35 +37,32 @@ class DocuMind:
             evaluation_enabled: Enable evaluation
             storage_path: Path for memory storage
             use_free_models: Use FREE Hugging Face models instead of OpenAI (default: True)
+            embedding_batch_size: Chunks embedded per model forward pass when setting up Q&A
+            ocr_workers: Pages OCR'd in parallel (default: min(CPU count, 4))
         """
         self.use_free_models = use_free_models
-        
-        # Initialize agents (OCR disabled by default to avoid build issues)
-        self.reader = ReaderAgent(ocr_enabled=False)  # OCR optional - disabled by default
-        self.extractor = ExtractorAgent()
-        
-        # Use FREE models by default
+        self.ocr_enabled = ocr_enabled
+        self.memory_enabled = memory_enabled
+        self.evaluation_enabled = evaluation_enabled
+        self.storage_path = storage_path
+        self.embedding_batch_size = embedding_batch_size
+        self.ocr_workers = ocr_workers
+        
+        # Use FREE models by default; they are the only analyzer/Q&A backend
         if use_free_models:
             logger.info("Using FREE Hugging Face models - No API key required!")
-            self.analyzer = AnalyzerAgent()  # FREE - no API key needed
-            self.qa = QAAgent()  # FREE - no API key needed
         else:
-            # Use OpenAI (requires API key)
+            # OpenAI mode would need separate OpenAI agent files
             self.api_key = api_key or os.getenv("OPENAI_API_KEY")
             if not self.api_key:
                 logger.warning("OpenAI API key not provided. Switching to FREE models.")
-                self.analyzer = AnalyzerAgent()
-                self.qa = QAAgent()
-                self.use_free_models = True
             else:
-                # Use OpenAI (would need separate OpenAI agent files)
                 logger.warning("OpenAI mode not fully implemented. Using FREE models instead.")
-                self.analyzer = AnalyzerAgent()
-                self.qa = QAAgent()
-                self.use_free_models = True
+            self.use_free_models = True
         
-        self.memory = MemoryAgent(storage_path=storage_path) if memory_enabled else None
-        self.evaluator = EvaluatorAgent() if evaluation_enabled else None
+        # Agents are created on first use (see the properties below), so a
+        # caller that only searches memory never loads the summarization or
+        # embedding models
         
         # Current document state
         self.current_document = None
@@ -77,6 +70,46 @@ class DocuMind:
         
         logger.info("DocuMind initialized")
     
+    @functools.cached_property
+    def reader(self):
+        """Reader agent (OCR falls back to text extraction when its dependencies are missing)"""
+        from .agents.reader import ReaderAgent
+        return ReaderAgent(ocr_enabled=self.ocr_enabled, ocr_workers=self.ocr_workers)
+    
+    @functools.cached_property
+    def extractor(self):
+        """Extractor agent"""
+        from .agents.extractor import ExtractorAgent
+        return ExtractorAgent()
+    
+    @functools.cached_property
+    def analyzer(self):
+        """Analyzer agent (FREE - no API key needed)"""
+        from .agents.analyzer import AnalyzerAgent
+        return AnalyzerAgent()
+    
+    @functools.cached_property
+    def qa(self):
+        """Q&A agent (FREE - no API key needed)"""
+        from .agents.qa_agent import QAAgent
+        return QAAgent(embedding_batch_size=self.embedding_batch_size)
+    
+    @functools.cached_property
+    def memory(self):
+        """Memory agent, or None when memory is disabled"""
+        if not self.memory_enabled:
+            return None
+        from .agents.memory import MemoryAgent
+        return MemoryAgent(storage_path=self.storage_path)
+    
+    @functools.cached_property
+    def evaluator(self):
+        """Evaluator agent, or None when evaluation is disabled"""
+        if not self.evaluation_enabled:
+            return None
+        from .agents.evaluator import EvaluatorAgent
+        return EvaluatorAgent()
+    
     def process_document(
         self,
         source: str,
@@ -140,25 +173,18 @@ class DocuMind:
         
         # Step 3: Generate summaries
         if "summarize" in tasks:
-            if self.analyzer:
-                logger.info("Generating summaries using FREE models...")
-                summaries = self.analyzer.generate_summaries(document)
-                results["summaries"] = summaries
-                
-                if self.memory:
-                    self.memory.store_summaries(document_id, summaries)
-            else:
-                logger.warning("Analyzer not available. Skipping summarization.")
-                results["summaries"] = {}
+            logger.info("Generating summaries using FREE models...")
+            summaries = self.analyzer.generate_summaries(document)
+            results["summaries"] = summaries
+            
+            if self.memory:
+                self.memory.store_summaries(document_id, summaries)
         
         # Step 4: Set up Q&A
         if "qa" in tasks:
-            if self.qa:
-                logger.info("Setting up Q&A system with FREE models...")
-                self.qa.setup_document(document)
-                results["qa"] = self.qa
-            else:
-                logger.warning("Q&A agent not available. Skipping Q&A setup.")
+            logger.info("Setting up Q&A system with FREE models...")
+            self.qa.setup_document(document)
+            results["qa"] = self.qa
         
         # Step 5: Evaluate outputs
         if "evaluate" in tasks and self.evaluator:
@@ -195,7 +221,8 @@ class DocuMind:
         Returns:
             Answer dictionary
         """
-        if not self.qa:
+        # Checked without touching the property so an unused Q&A agent is not loaded here
+        if "qa" not in self.__dict__:
             return {
                 "answer": "Q&A system not available. Please process document with Q&A enabled first.",
                 "citations": [],
@@ -238,6 +265,21 @@ class DocuMind:
         summaries = self.memory.session_memory.context.get("summaries", {}).get(self.current_document_id, {})
         return summaries.get(summary_type)
     
+    def stream_summary(self) -> Iterator[str]:
+        """
+        Stream the executive summary of the current document as it is generated
+        
+        Yields:
+            Summary text fragments
+        """
+        if not self.current_document:
+            return
+        
+        yield from self.analyzer.stream_executive_summary(
+            self.current_document.get("text", ""),
+            self.current_document.get("metadata", {})
+        )
+    
     def get_extractions(self) -> Optional[Dict]:
         """Get extracted information"""
         if not self.current_document_id or not self.memory:
@@ -263,8 +305,9 @@ class DocuMind:
     
     def _generate_document_id(self, source: str) -> str:
         """Generate unique document ID from source"""
-        source_hash = hashlib.md5(source.encode()).hexdigest()
-        return f"doc_{source_hash[:12]}"
+        # 6-byte digest gives the same 12 hex characters without truncating a longer hash
+        source_hash = hashlib.blake2b(source.encode(), digest_size=6).hexdigest()
+        return f"doc_{source_hash}"
     
     def resume_from_checkpoint(self, checkpoint_id: str) -> Dict:
         """
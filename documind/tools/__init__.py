@@ -1,14 +1,36 @@
 """DocuMind Tools Module"""
 
-from .pdf_parser import PDFParser
-from .ocr import OCRProcessor
-from .table_extractor import TableExtractor
-from .chunker import DocumentChunker
+import importlib
+
+# Tools pull in pdfplumber, pytesseract, pandas, etc., so they are imported
+# on first attribute access instead of at package import (PEP 562)
+_LAZY = {
+    "PDFParser": ("documind.tools.pdf_parser", "PDFParser"),
+    "OCRProcessor": ("documind.tools.ocr", "OCRProcessor"),
+    "TableExtractor": ("documind.tools.table_extractor", "TableExtractor"),
+    "DocumentChunker": ("documind.tools.chunker", "DocumentChunker"),
+    "OnnxEmbedder": ("documind.tools.onnx_embedder", "OnnxEmbedder"),
+    "InMemoryVectorIndex": ("documind.tools.vector_index", "InMemoryVectorIndex"),
+}
 
 __all__ = [
     "PDFParser",
     "OCRProcessor",
     "TableExtractor",
     "DocumentChunker",
+    "OnnxEmbedder",
+    "InMemoryVectorIndex",
 ]
 
+
+def __getattr__(name):
+    if name not in _LAZY:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    module_name, attr = _LAZY[name]
+    value = getattr(importlib.import_module(module_name), attr)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
@@ -1,7 +1,8 @@
 """Document Chunking Utilities"""
 
-from typing import List, Dict, Optional
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
 import re
+import numpy as np
 from loguru import logger
 
 
@@ -14,7 +15,7 @@ class DocumentChunker:
         
         Args:
             chunk_size: Target chunk size in characters
-            chunk_overlap: Overlap between chunks
+            chunk_overlap: Overlap between chunks in characters (whole words)
         """
         self.chunk_size = chunk_size
         self.chunk_overlap = chunk_overlap
@@ -29,44 +30,64 @@ class DocumentChunker:
         Returns:
             List of chunks with metadata
         """
-        chunks = []
-        words = text.split()
-        current_chunk = []
-        current_length = 0
+        words, spans = self.chunk_spans(text)
         
-        for word in words:
-            word_length = len(word) + 1  # +1 for space
-            
-            if current_length + word_length > self.chunk_size and current_chunk:
-                # Save current chunk
-                chunk_text = " ".join(current_chunk)
-                chunks.append({
-                    "text": chunk_text,
-                    "char_count": len(chunk_text),
-                    "word_count": len(current_chunk),
-                    "chunk_index": len(chunks)
-                })
-                
-                # Start new chunk with overlap
-                overlap_words = current_chunk[-self.chunk_overlap//10:] if len(current_chunk) > self.chunk_overlap//10 else []
-                current_chunk = overlap_words + [word]
-                current_length = sum(len(w) + 1 for w in current_chunk)
-            else:
-                current_chunk.append(word)
-                current_length += word_length
-        
-        # Add final chunk
-        if current_chunk:
-            chunk_text = " ".join(current_chunk)
+        chunks = []
+        for chunk_index, (start, end) in enumerate(spans.tolist()):
+            chunk_text = " ".join(words[start:end])
             chunks.append({
                 "text": chunk_text,
                 "char_count": len(chunk_text),
-                "word_count": len(current_chunk),
-                "chunk_index": len(chunks)
+                "word_count": end - start,
+                "chunk_index": chunk_index
             })
         
         return chunks
     
+    def chunk_spans(self, text: str) -> Tuple[List[str], np.ndarray]:
+        """
+        Compute chunk boundaries without building chunk strings or dicts
+        
+        Chunk i is " ".join(words[spans[i, 0]:spans[i, 1]]), the same text
+        chunk_text returns, so callers that only need chunk counts, sizes or
+        positions can skip materializing it.
+        
+        Args:
+            text: Input text
+        
+        Returns:
+            Tuple of the text's words and an (n_chunks, 2) array of word ranges
+        """
+        words = text.split()
+        n = len(words)
+        if not n:
+            return words, np.zeros((0, 2), dtype=np.int64)
+        
+        # ends[i] is the length of words[:i] with a space after each word, so
+        # words[a:b] takes ends[b] - ends[a] characters
+        ends = np.zeros(n + 1, dtype=np.int64)
+        np.cumsum(np.fromiter(map(len, words), dtype=np.int64, count=n) + 1, out=ends[1:])
+        
+        bounds = []
+        start = 0
+        first_new = 0  # First word not carried over from the previous chunk; always included
+        while True:
+            # Extend the chunk up to the first word that would take it past chunk_size
+            end = int(np.searchsorted(ends, ends[start] + self.chunk_size, side="right")) - 1
+            end = max(end, first_new + 1)
+            if end >= n:
+                bounds.append((start, n))
+                break
+            bounds.append((start, end))
+            
+            # Start new chunk with the trailing words that fit in chunk_overlap characters;
+            # an overlap that would carry over the whole chunk is dropped so chunks advance
+            overlap_start = int(np.searchsorted(ends, ends[end] - self.chunk_overlap, side="left"))
+            start = overlap_start if overlap_start > start else end
+            first_new = end
+        
+        return words, np.array(bounds, dtype=np.int64)
+    
     def chunk_with_pages(self, text: str, pages_metadata: List[Dict]) -> List[Dict]:
         """
         Chunk text while preserving page references
@@ -78,8 +99,11 @@ class DocumentChunker:
         Returns:
             List of chunks with page references
         """
-        # Split text by pages first
-        page_texts = []
+        return list(self.chunk_with_pages_stream(self._iter_page_sections(text, pages_metadata)))
+    
+    @staticmethod
+    def _iter_page_sections(text: str, pages_metadata: List[Dict]) -> Iterator[Tuple[int, str]]:
+        """Yield (page number, page text) sections of the full text one at a time"""
         current_page = 1
         page_start = 0
         
@@ -89,28 +113,28 @@ class DocumentChunker:
             
             if page_num > current_page:
                 # Extract text for previous pages
-                page_text = text[page_start:page_start + page_length]
-                page_texts.append({
-                    "page": current_page,
-                    "text": page_text
-                })
+                yield current_page, text[page_start:page_start + page_length]
                 page_start += page_length
                 current_page = page_num
         
         # Add last page
         if page_start < len(text):
-            page_texts.append({
-                "page": current_page,
-                "text": text[page_start:]
-            })
+            yield current_page, text[page_start:]
+    
+    def chunk_with_pages_stream(self, pages: Iterable[Tuple[int, str]]) -> Iterator[Dict]:
+        """
+        Chunk pages one at a time, yielding chunks as each page is processed
         
-        # Now chunk each page section
-        chunks = []
-        for page_data in page_texts:
-            page_chunks = self.chunk_text(page_data["text"])
-            for chunk in page_chunks:
-                chunk["page"] = page_data["page"]
-                chunks.append(chunk)
+        Unlike chunk_with_pages, this needs neither the joined document text nor
+        character offsets into it, so only the current page is being chunked.
         
-        return chunks
-
+        Args:
+            pages: (page number, page text) pairs in page order
+        
+        Yields:
+            Chunks with page references
+        """
+        for page_num, page_text in pages:
+            for chunk in self.chunk_text(page_text):
+                chunk["page"] = page_num
+                yield chunk
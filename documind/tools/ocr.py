@@ -3,25 +3,82 @@
 import pytesseract
 from pdf2image import convert_from_path
 from PIL import Image
-from typing import Optional
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Iterator, List, Optional
 from loguru import logger
+import numpy as np
 import os
+import queue
+import subprocess
+import tempfile
+import threading
+
+from .pdf_handle import open_pdf
+
+
+def _tesseract_env() -> Dict[str, str]:
+    """
+    Environment for tesseract runs that go in parallel, where OpenMP threads
+    inside each would oversubscribe the CPU. An OMP_THREAD_LIMIT already set
+    by the user is kept.
+    """
+    env = dict(os.environ)
+    env.setdefault("OMP_THREAD_LIMIT", "1")
+    return env
 
 
 class OCRProcessor:
     """OCR processing for scanned documents"""
     
-    def __init__(self, tesseract_cmd: Optional[str] = None, language: str = "eng"):
+    def __init__(self, tesseract_cmd: Optional[str] = None, language: str = "eng", preprocess: bool = True):
         """
         Initialize OCR processor
         
         Args:
             tesseract_cmd: Path to tesseract executable
             language: OCR language code
+            preprocess: Binarize images with OpenCV before OCR (skipped if OpenCV is not installed)
         """
         if tesseract_cmd:
             pytesseract.pytesseract.tesseract_cmd = tesseract_cmd
         self.language = language
+        self.preprocess = preprocess
+        
+        # tesserocr keeps engines loaded in process instead of starting a
+        # tesseract executable (and reloading its model) for every image.
+        # Idle engines wait in a queue; more are created on demand, one per OCR thread.
+        self._api_factory = None
+        self._idle_apis = queue.Queue()
+        self._api_count = 0
+        self._max_apis = min(os.cpu_count() or 1, 4)
+        self._api_lock = threading.Lock()
+        try:
+            from tesserocr import PyTessBaseAPI, PSM
+            self._api_factory = lambda: PyTessBaseAPI(lang=language, psm=PSM.AUTO)
+            self._idle_apis.put(self._api_factory())
+            self._api_count = 1
+        except ImportError:
+            self._api_factory = None
+        except Exception as e:
+            logger.warning(f"tesserocr unavailable ({e}); using the tesseract executable")
+            self._api_factory = None
+    
+    def close(self):
+        """Release the in-process tesseract engines"""
+        while True:
+            try:
+                api = self._idle_apis.get_nowait()
+            except queue.Empty:
+                break
+            api.End()
+        self._api_count = 0
+    
+    def __del__(self):
+        try:
+            self.close()
+        except Exception:
+            pass
     
     def ocr_page(self, pdf_path: str, page_num: int) -> str:
         """
@@ -36,23 +93,277 @@ class OCRProcessor:
         """
         try:
             # Convert PDF page to image
-            images = convert_from_path(pdf_path, first_page=page_num, last_page=page_num)
+            images = self._render_pages(pdf_path, [page_num])
             if images:
                 image = images[0]
                 # Perform OCR
-                text = pytesseract.image_to_string(image, lang=self.language)
-                return text
+                return self._image_to_string(image)
             return ""
         except Exception as e:
             logger.error(f"Error performing OCR on page {page_num}: {e}")
             return ""
     
+    def ocr_document(self, pdf_path: str, max_workers: Optional[int] = None) -> List[str]:
+        """
+        Perform OCR on every page of a PDF
+        
+        Args:
+            pdf_path: Path to PDF file
+            max_workers: Parallel OCR workers (default: min(CPU count, 4))
+        
+        Returns:
+            Extracted text per page, in page order
+        """
+        try:
+            total_pages = self._page_count(pdf_path)
+        except Exception as e:
+            logger.error(f"Error reading page count of {pdf_path}: {e}")
+            return []
+        
+        page_numbers = list(range(1, total_pages + 1))
+        texts = self.ocr_pages(pdf_path, page_numbers, max_workers=max_workers)
+        return [texts.get(page_num, "") for page_num in page_numbers]
+    
+    def ocr_document_fast(self, pdf_path: str) -> List[str]:
+        """
+        Perform OCR on every page of a PDF with one pdftoppm and one tesseract run
+        
+        Pages are rendered straight to grayscale PNG files by poppler and read by
+        a single tesseract process, so no page image passes through Python and the
+        model loads once. OpenCV preprocessing is not applied. Falls back to
+        ocr_document if either executable fails.
+        
+        Args:
+            pdf_path: Path to PDF file
+        
+        Returns:
+            Extracted text per page, in page order
+        """
+        try:
+            with tempfile.TemporaryDirectory(prefix="documind_ocr_") as tmp_dir:
+                subprocess.run(
+                    ["pdftoppm", "-r", "200", "-gray", "-png", pdf_path, os.path.join(tmp_dir, "page")],
+                    check=True, capture_output=True
+                )
+                # pdftoppm zero-pads page numbers to a common width, so name order is page order
+                image_paths = sorted(
+                    os.path.join(tmp_dir, name) for name in os.listdir(tmp_dir) if name.endswith(".png")
+                )
+                if not image_paths:
+                    return []
+                
+                list_file = os.path.join(tmp_dir, "pages.txt")
+                with open(list_file, "w", encoding="utf-8") as f:
+                    f.write("\n".join(image_paths) + "\n")
+                
+                completed = subprocess.run(
+                    [pytesseract.pytesseract.tesseract_cmd, list_file, "stdout", "-l", self.language],
+                    check=True, capture_output=True
+                )
+            
+            texts = completed.stdout.decode("utf-8", errors="replace").split("\f")
+            if len(texts) < len(image_paths):
+                raise RuntimeError("page count mismatch in tesseract output")
+            return texts[:len(image_paths)]
+        except Exception as e:
+            logger.warning(f"Single-run OCR failed ({e}); falling back to ocr_document")
+            return self.ocr_document(pdf_path)
+    
+    def ocr_pages(
+        self,
+        pdf_path: str,
+        page_numbers: List[int],
+        max_workers: Optional[int] = None,
+        document=None
+    ) -> Dict[int, str]:
+        """
+        Perform OCR on several PDF pages
+        
+        Pages are OCR'd by up to max_workers threads. With tesserocr each thread
+        uses its own loaded engine; otherwise each thread OCRs its share of pages
+        in a single tesseract run over a list of page images, so the executable
+        starts once per thread instead of once per page.
+        
+        Args:
+            pdf_path: Path to PDF file
+            page_numbers: Page numbers (1-indexed)
+            max_workers: Parallel tesseract runs (default: min(CPU count, 4))
+            document: PdfDocument already opened with open_pdf, rendered from instead of reparsing the file
+        
+        Returns:
+            Extracted text by page number
+        """
+        if not page_numbers:
+            return {}
+        
+        workers = max(1, min(max_workers or min(os.cpu_count() or 1, 4), len(page_numbers)))
+        
+        if self._api_factory is not None:
+            with self._api_lock:
+                self._max_apis = max(self._max_apis, workers)
+            # Engines stay loaded, so pages go straight to a thread pool, one engine per thread
+            # (tesseract releases the GIL while recognizing)
+            try:
+                results = {}
+                pending = deque()
+                with ThreadPoolExecutor(max_workers=workers) as executor:
+                    # Rendered in this thread, as PDFium is not thread-safe; a bounded
+                    # window of pages in flight keeps rendered images from piling up
+                    for page_num, image in zip(page_numbers, self._iter_page_images(pdf_path, page_numbers, document)):
+                        pending.append((page_num, executor.submit(self._ocr_prepared, image)))
+                        if len(pending) >= 2 * workers:
+                            done_page, future = pending.popleft()
+                            results[done_page] = future.result()
+                    for done_page, future in pending:
+                        results[done_page] = future.result()
+                return results
+            except Exception as e:
+                logger.warning(f"OCR failed ({e}); falling back to per-page OCR")
+                return {page_num: self.ocr_page(pdf_path, page_num) for page_num in page_numbers}
+        
+        try:
+            results = {}
+            with tempfile.TemporaryDirectory(prefix="documind_ocr_") as tmp_dir:
+                # Rendered up front in this thread, as PDFium is not thread-safe
+                image_paths = self._render_pages(pdf_path, page_numbers, output_folder=tmp_dir, document=document)
+                if len(image_paths) != len(page_numbers):
+                    raise RuntimeError("page count mismatch in rendered pages")
+                
+                groups = [list(range(i, len(page_numbers), workers)) for i in range(workers)]
+                with ThreadPoolExecutor(max_workers=workers) as executor:
+                    batches = executor.map(
+                        lambda group: self._ocr_batch([image_paths[i] for i in group], tmp_dir),
+                        groups
+                    )
+                    for group, texts in zip(groups, batches):
+                        results.update((page_numbers[i], text) for i, text in zip(group, texts))
+            return results
+        except Exception as e:
+            logger.warning(f"Batched OCR failed ({e}); falling back to per-page OCR")
+            return {page_num: self.ocr_page(pdf_path, page_num) for page_num in page_numbers}
+    
+    def _ocr_prepared(self, image: Image.Image) -> str:
+        """Preprocess and OCR one image"""
+        return self._image_to_string(self._preprocess(image))
+    
+    def _image_to_string(self, image: Image.Image) -> str:
+        """OCR one image with an in-process engine if available, the tesseract executable otherwise"""
+        if self._api_factory is None:
+            return pytesseract.image_to_string(image, lang=self.language)
+        
+        api = self._acquire_api()
+        try:
+            api.SetImage(image)
+            return api.GetUTF8Text()
+        finally:
+            self._idle_apis.put(api)
+    
+    def _acquire_api(self):
+        """Take an idle tesserocr engine, creating one if all are busy and the limit allows"""
+        try:
+            return self._idle_apis.get_nowait()
+        except queue.Empty:
+            pass
+        with self._api_lock:
+            if self._api_count < self._max_apis:
+                self._api_count += 1
+                return self._api_factory()
+        # A tesseract engine must not be used from two threads at once; wait for a free one
+        return self._idle_apis.get()
+    
+    def _render_pages(
+        self,
+        pdf_path: str,
+        page_numbers: List[int],
+        output_folder: Optional[str] = None,
+        document=None
+    ) -> List:
+        """
+        Render PDF pages at 200 dpi and prepare them for OCR
+        
+        Args:
+            pdf_path: Path to PDF file
+            page_numbers: Page numbers (1-indexed)
+            output_folder: Save PNG files here and return their paths instead of images
+            document: Already-open PdfDocument to render from
+        
+        Returns:
+            PIL images, or file paths when output_folder is given
+        """
+        rendered = []
+        for page_num, image in zip(page_numbers, self._iter_page_images(pdf_path, page_numbers, document)):
+            image = self._preprocess(image)
+            if output_folder is not None:
+                image_path = os.path.join(output_folder, f"page_{page_num}.png")
+                image.save(image_path)
+                image = image_path
+            rendered.append(image)
+        return rendered
+    
+    def _page_count(self, pdf_path: str) -> int:
+        """Number of pages in a PDF"""
+        with open_pdf(pdf_path) as pdf:
+            if pdf is not None:
+                return len(pdf)
+        
+        from pdf2image import pdfinfo_from_path
+        return int(pdfinfo_from_path(pdf_path)["Pages"])
+    
+    def _iter_page_images(self, pdf_path: str, page_numbers: List[int], document=None) -> Iterator[Image.Image]:
+        """Yield page images one at a time, with PDFium when pypdfium2 is installed and poppler (pdf2image) otherwise"""
+        with open_pdf(pdf_path, document) as pdf:
+            if pdf is None:
+                for page_num in page_numbers:
+                    yield from convert_from_path(pdf_path, first_page=page_num, last_page=page_num)
+                return
+            
+            # In process, so no poppler subprocess and disk round-trip per page
+            for page_num in page_numbers:
+                page = pdf[page_num - 1]
+                image = page.render(scale=200 / 72).to_pil()
+                page.close()
+                yield image
+    
+    def _preprocess(self, image: Image.Image) -> Image.Image:
+        """
+        Grayscale, contrast-equalize (CLAHE) and Otsu-binarize an image, which
+        improves tesseract accuracy on scans and leaves it fewer pixels to classify
+        """
+        if not self.preprocess:
+            return image
+        try:
+            import cv2
+        except ImportError:
+            logger.warning("OpenCV not installed; OCR preprocessing disabled")
+            self.preprocess = False
+            return image
+        
+        gray = np.asarray(image.convert("L"))
+        gray = cv2.createCLAHE(clipLimit=2.0, tileGridSize=(8, 8)).apply(gray)
+        _, binary = cv2.threshold(gray, 0, 255, cv2.THRESH_BINARY + cv2.THRESH_OTSU)
+        return Image.fromarray(binary)
+    
+    def _ocr_batch(self, image_paths: List[str], tmp_dir: str) -> List[str]:
+        """OCR several page images in one tesseract run"""
+        # Tesseract reads a .txt input as a list of images and separates their text with form feeds
+        list_file = os.path.join(tmp_dir, f"pages_{os.path.basename(image_paths[0])}.txt")
+        with open(list_file, "w", encoding="utf-8") as f:
+            f.write("\n".join(image_paths) + "\n")
+        
+        completed = subprocess.run(
+            [pytesseract.pytesseract.tesseract_cmd, list_file, "stdout", "-l", self.language],
+            check=True, capture_output=True, env=_tesseract_env()
+        )
+        texts = completed.stdout.decode("utf-8", errors="replace").split("\f")
+        if len(texts) < len(image_paths):
+            raise RuntimeError("page count mismatch in batched OCR output")
+        return texts[:len(image_paths)]
+    
     def ocr_image(self, image_path: str) -> str:
         """Perform OCR on an image file"""
         try:
-            image = Image.open(image_path)
-            text = pytesseract.image_to_string(image, lang=self.language)
-            return text
+            image = self._preprocess(Image.open(image_path))
+            return self._image_to_string(image)
         except Exception as e:
             logger.error(f"Error performing OCR on image: {e}")
             return ""
@@ -0,0 +1,99 @@
+"""ONNX Runtime Sentence Embedder"""
+
+from typing import List, Union
+import os
+import numpy as np
+from loguru import logger
+
+
+class OnnxEmbedder:
+    """
+    Sentence embedder running a dynamically int8-quantized ONNX export of a
+    sentence-transformers model, with the same encode() call shape as
+    SentenceTransformer (mean pooling + L2 normalization, as all-MiniLM-L6-v2 does)
+    """
+    
+    def __init__(
+        self,
+        model_name: str = "sentence-transformers/all-MiniLM-L6-v2",
+        cache_dir: str = ".documind_models",
+        max_seq_length: int = 256
+    ):
+        """
+        Initialize ONNX embedder (needs optimum[onnxruntime])
+        
+        Args:
+            model_name: Hugging Face model name of the sentence-transformers model
+            cache_dir: Directory for the exported and quantized model
+            max_seq_length: Maximum tokens per text
+        """
+        from optimum.onnxruntime import ORTModelForFeatureExtraction, ORTQuantizer
+        from optimum.onnxruntime.configuration import AutoQuantizationConfig
+        from transformers import AutoTokenizer
+        
+        save_dir = os.path.join(cache_dir, model_name.replace("/", "--") + "-int8")
+        if not os.path.isdir(save_dir):
+            logger.info(f"Exporting {model_name} to int8 ONNX in {save_dir}")
+            model = ORTModelForFeatureExtraction.from_pretrained(model_name, export=True)
+            quantizer = ORTQuantizer.from_pretrained(model)
+            quantizer.quantize(
+                save_dir=save_dir,
+                quantization_config=AutoQuantizationConfig.avx512_vnni(is_static=False, per_channel=False)
+            )
+        
+        self.model = ORTModelForFeatureExtraction.from_pretrained(save_dir, file_name="model_quantized.onnx")
+        self.tokenizer = AutoTokenizer.from_pretrained(model_name)
+        self.max_seq_length = max_seq_length
+    
+    def encode(
+        self,
+        sentences: Union[str, List[str]],
+        batch_size: int = 32,
+        show_progress_bar: bool = False,
+        convert_to_numpy: bool = True,
+        normalize_embeddings: bool = True
+    ) -> np.ndarray:
+        """
+        Encode texts into embeddings
+        
+        Args:
+            sentences: Text or list of texts
+            batch_size: Texts per forward pass
+            show_progress_bar: Accepted for SentenceTransformer compatibility
+            convert_to_numpy: Accepted for SentenceTransformer compatibility (always numpy)
+            normalize_embeddings: L2-normalize the embeddings
+        
+        Returns:
+            Array of shape (len(sentences), dim), or (dim,) for a single text
+        """
+        single = isinstance(sentences, str)
+        texts = [sentences] if single else list(sentences)
+        if not texts:
+            return np.zeros((0, 0), dtype=np.float32)
+        
+        # Sort by length so each batch pads to similar lengths, then restore order
+        order = np.argsort([-len(text) for text in texts], kind="stable")
+        embeddings = [None] * len(texts)
+        
+        for start in range(0, len(texts), batch_size):
+            batch_idx = order[start:start + batch_size]
+            inputs = self.tokenizer(
+                [texts[i] for i in batch_idx],
+                padding=True,
+                truncation=True,
+                max_length=self.max_seq_length,
+                return_tensors="np"
+            )
+            token_embeddings = np.asarray(self.model(**inputs).last_hidden_state)
+            
+            # Mean pooling over the non-padding tokens
+            mask = inputs["attention_mask"][..., None].astype(np.float32)
+            pooled = (token_embeddings * mask).sum(axis=1) / np.clip(mask.sum(axis=1), 1e-9, None)
+            if normalize_embeddings:
+                pooled /= np.clip(np.linalg.norm(pooled, axis=1, keepdims=True), 1e-12, None)
+            
+            for i, row in zip(batch_idx, pooled):
+                embeddings[i] = row
+        
+        result = np.vstack(embeddings).astype(np.float32, copy=False)
+        return result[0] if single else result
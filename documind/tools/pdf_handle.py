@@ -0,0 +1,34 @@
+"""Shared PDFium Document Handle"""
+
+from contextlib import contextmanager
+from typing import Iterator, Optional
+
+
+@contextmanager
+def open_pdf(pdf_path: str, document=None) -> Iterator[Optional[object]]:
+    """
+    Open a PDF once with PDFium so text extraction and OCR rendering can share
+    the parsed document instead of each parsing the file again
+    
+    Args:
+        pdf_path: Path to PDF file
+        document: Already-open PdfDocument to reuse; it is yielded as-is and left open
+    
+    Yields:
+        pypdfium2 PdfDocument, or None if pypdfium2 is not installed
+    """
+    if document is not None:
+        yield document
+        return
+    
+    try:
+        import pypdfium2 as pdfium
+    except ImportError:
+        yield None
+        return
+    
+    pdf = pdfium.PdfDocument(pdf_path)
+    try:
+        yield pdf
+    finally:
+        pdf.close()
@@ -1,30 +1,63 @@
 """PDF Parsing Utilities"""
 
-import pdfplumber
-import PyPDF2
 from typing import List, Dict
 from loguru import logger
 
 
+def _import_pymupdf():
+    """PyMuPDF if installed (imported as pymupdf by current releases, fitz by older ones)"""
+    try:
+        import pymupdf
+        return pymupdf
+    except ImportError:
+        pass
+    try:
+        import fitz
+        return fitz
+    except ImportError:
+        return None
+
+
 class PDFParser:
     """Utility class for PDF parsing operations"""
     
     def extract_text(self, pdf_path: str) -> str:
-        """Extract text from PDF"""
-        text = ""
+        """Extract text from PDF (PyMuPDF when installed, pdfplumber otherwise)"""
+        fitz = _import_pymupdf()
+        
+        page_texts = []
         try:
-            with pdfplumber.open(pdf_path) as pdf:
-                for page in pdf.pages:
-                    page_text = page.extract_text()
-                    if page_text:
-                        text += page_text + "\n\n"
+            if fitz is not None:
+                with fitz.open(pdf_path) as doc:
+                    page_texts = [page.get_text("text") for page in doc]
+            else:
+                import pdfplumber
+                
+                with pdfplumber.open(pdf_path) as pdf:
+                    page_texts = [page.extract_text() for page in pdf.pages]
         except Exception as e:
             logger.error(f"Error extracting text: {e}")
-        return text
+        return "".join(page_text + "\n\n" for page_text in page_texts if page_text)
     
     def get_metadata(self, pdf_path: str) -> Dict:
-        """Extract PDF metadata"""
+        """Extract PDF metadata (PyMuPDF when installed, PyPDF2 otherwise)"""
+        fitz = _import_pymupdf()
+        
         try:
+            if fitz is not None:
+                with fitz.open(pdf_path) as doc:
+                    metadata = doc.metadata or {}
+                    return {
+                        "title": metadata.get("title", ""),
+                        "author": metadata.get("author", ""),
+                        "subject": metadata.get("subject", ""),
+                        "creator": metadata.get("creator", ""),
+                        "producer": metadata.get("producer", ""),
+                        "num_pages": doc.page_count
+                    }
+            
+            import PyPDF2
+            
             with open(pdf_path, "rb") as f:
                 pdf_reader = PyPDF2.PdfReader(f)
                 metadata = pdf_reader.metadata or {}
@@ -39,4 +72,3 @@ class PDFParser:
         except Exception as e:
             logger.error(f"Error extracting metadata: {e}")
             return {}
-
@@ -1,8 +1,8 @@
 """Table Extraction Utilities"""
 
-import pdfplumber
-import pandas as pd
-from typing import List, Dict, Optional
+import csv
+import io
+from typing import Dict, Iterator, List, Optional
 from loguru import logger
 import json
 
@@ -20,7 +20,21 @@ class TableExtractor:
         Returns:
             List of table dictionaries
         """
-        tables = []
+        return list(self.iter_tables_from_pdf(pdf_path))
+    
+    def iter_tables_from_pdf(self, pdf_path: str) -> Iterator[Dict]:
+        """
+        Extract tables from PDF one at a time, so callers that write or index
+        tables as they go never hold every table of a large PDF at once
+        
+        Args:
+            pdf_path: Path to PDF file
+        
+        Yields:
+            Table dictionaries
+        """
+        import pdfplumber
+        
         try:
             with pdfplumber.open(pdf_path) as pdf:
                 for page_num, page in enumerate(pdf.pages, 1):
@@ -29,18 +43,18 @@ class TableExtractor:
                         if table and len(table) > 1:  # At least header + one row
                             # Convert to structured format
                             structured_table = self._structure_table(table)
-                            tables.append({
+                            yield {
                                 "page": page_num,
                                 "table_index": table_idx,
                                 "data": structured_table,
                                 "rows": len(table),
                                 "cols": len(table[0]) if table else 0,
                                 "format": "json"
-                            })
+                            }
+                    # Release pdfminer's cached layout objects for the page
+                    page.flush_cache()
         except Exception as e:
             logger.error(f"Error extracting tables: {e}")
-        
-        return tables
     
     def _structure_table(self, table: List[List]) -> Dict:
         """
@@ -76,8 +90,14 @@ class TableExtractor:
     def table_to_csv(self, table: Dict) -> str:
         """Convert table to CSV format"""
         try:
-            df = pd.DataFrame(table["rows"])
-            return df.to_csv(index=False)
+            rows = table["rows"]
+            # Columns in order of first appearance, as a DataFrame of the rows would have
+            fieldnames = list(dict.fromkeys(key for row in rows for key in row))
+            output = io.StringIO()
+            writer = csv.DictWriter(output, fieldnames=fieldnames, lineterminator="\n")
+            writer.writeheader()
+            writer.writerows(rows)
+            return output.getvalue()
         except Exception as e:
             logger.error(f"Error converting table to CSV: {e}")
             return ""
@@ -0,0 +1,126 @@
+"""In-Memory Vector Index"""
+
+from typing import Dict, List, Optional
+import numpy as np
+from loguru import logger
+
+
+class InMemoryVectorIndex:
+    """
+    Vector index for a single document's chunks, held in one contiguous
+    float32 matrix. Exposes the add()/query()/count() subset of a Chroma
+    collection, with the same result layout and squared-L2 distances, so it
+    can stand in for one without the SQLite and serialization overhead.
+    
+    Large indexes are served by an hnswlib graph when hnswlib is installed;
+    smaller ones are searched exactly with a single matrix product.
+    """
+    
+    def __init__(self, hnsw_threshold: int = 10000, ef_construction: int = 128, m: int = 24, ef_search: int = 100):
+        """
+        Initialize vector index
+        
+        Args:
+            hnsw_threshold: Number of vectors from which an HNSW graph is used
+            ef_construction: HNSW build-time candidate list size
+            m: HNSW graph degree
+            ef_search: HNSW query-time candidate list size
+        """
+        self.hnsw_threshold = hnsw_threshold
+        self.ef_construction = ef_construction
+        self.m = m
+        self.ef_search = ef_search
+        
+        self._batches = []
+        self._embeddings = None
+        self._sq_norms = None
+        self._hnsw = None
+        self.ids = []
+        self.documents = []
+        self.metadatas = []
+    
+    def add(self, embeddings, documents: List[str], ids: List[str], metadatas: Optional[List[Dict]] = None):
+        """
+        Add vectors with their documents, ids and metadata
+        
+        Args:
+            embeddings: Array or list of vectors
+            documents: Texts for the vectors
+            ids: Identifiers for the vectors
+            metadatas: Optional metadata dictionaries for the vectors
+        """
+        self._batches.append(np.asarray(embeddings, dtype=np.float32))
+        self.documents.extend(documents)
+        self.ids.extend(ids)
+        self.metadatas.extend(metadatas if metadatas is not None else [{} for _ in ids])
+        # Rebuilt lazily on the next query
+        self._embeddings = None
+        self._hnsw = None
+    
+    def count(self) -> int:
+        """Number of stored vectors"""
+        return len(self.ids)
+    
+    def query(self, query_embeddings, n_results: int = 10) -> Dict:
+        """
+        Find the nearest stored vectors for each query vector
+        
+        Args:
+            query_embeddings: Array or list of query vectors
+            n_results: Number of neighbours per query
+        
+        Returns:
+            Chroma-style dictionary of per-query lists: ids, documents, metadatas, distances
+        """
+        queries = np.atleast_2d(np.asarray(query_embeddings, dtype=np.float32))
+        results = {"ids": [], "documents": [], "metadatas": [], "distances": []}
+        
+        k = min(n_results, self.count())
+        if k <= 0:
+            for _ in range(len(queries)):
+                for values in results.values():
+                    values.append([])
+            return results
+        
+        self._build()
+        if self._hnsw is not None:
+            self._hnsw.set_ef(max(self.ef_search, k))
+            labels, distances = self._hnsw.knn_query(queries, k=k)
+        else:
+            # Squared L2 from one matrix product: |x|^2 - 2 x.q + |q|^2
+            distances = self._sq_norms[None, :] - 2.0 * (queries @ self._embeddings.T)
+            distances += np.einsum("ij,ij->i", queries, queries)[:, None]
+            labels = np.argpartition(distances, k - 1, axis=1)[:, :k]
+            top = np.take_along_axis(distances, labels, axis=1)
+            order = np.argsort(top, axis=1)
+            labels = np.take_along_axis(labels, order, axis=1)
+            distances = np.maximum(np.take_along_axis(top, order, axis=1), 0.0)
+        
+        for row_labels, row_distances in zip(labels, distances):
+            results["ids"].append([self.ids[i] for i in row_labels])
+            results["documents"].append([self.documents[i] for i in row_labels])
+            results["metadatas"].append([self.metadatas[i] for i in row_labels])
+            results["distances"].append([float(d) for d in row_distances])
+        
+        return results
+    
+    def _build(self):
+        """Concatenate added batches and build the HNSW graph when it pays off"""
+        if self._embeddings is not None:
+            return
+        
+        self._embeddings = np.ascontiguousarray(np.vstack(self._batches))
+        self._batches = [self._embeddings]
+        self._sq_norms = np.einsum("ij,ij->i", self._embeddings, self._embeddings)
+        
+        if len(self._embeddings) >= self.hnsw_threshold:
+            try:
+                import hnswlib
+            except ImportError:
+                logger.info("hnswlib not installed; using exact search")
+                return
+            n, dim = self._embeddings.shape
+            index = hnswlib.Index(space="l2", dim=dim)
+            index.init_index(max_elements=n, ef_construction=self.ef_construction, M=self.m)
+            index.add_items(self._embeddings, np.arange(n))
+            self._hnsw = index
@@ -0,0 +1,83 @@
+"""
+Tests for Document Chunker
+"""
+
+import pytest
+from documind.tools.chunker import DocumentChunker
+
+
+def _words(count):
+    return " ".join(f"w{i}" for i in range(count))
+
+
+def test_chunk_text_empty():
+    """Test empty and whitespace-only text produce no chunks"""
+    chunker = DocumentChunker(chunk_size=50, chunk_overlap=10)
+    
+    assert chunker.chunk_text("") == []
+    assert chunker.chunk_text("   \n ") == []
+
+
+def test_chunk_text_respects_size_and_covers_text():
+    """Test chunks stay within chunk_size and together cover every word in order"""
+    chunker = DocumentChunker(chunk_size=50, chunk_overlap=0)
+    text = _words(200)
+    chunks = chunker.chunk_text(text)
+    
+    assert all(chunk["char_count"] <= 50 for chunk in chunks)
+    assert " ".join(chunk["text"] for chunk in chunks) == text
+    assert [chunk["chunk_index"] for chunk in chunks] == list(range(len(chunks)))
+    assert all(chunk["word_count"] == len(chunk["text"].split()) for chunk in chunks)
+
+
+def test_chunk_text_overlap_carries_trailing_words():
+    """Test each chunk starts with trailing words of the previous one that fit in chunk_overlap"""
+    chunker = DocumentChunker(chunk_size=50, chunk_overlap=20)
+    chunks = chunker.chunk_text(_words(200))
+    
+    for previous, chunk in zip(chunks, chunks[1:]):
+        previous_words = previous["text"].split()
+        words = chunk["text"].split()
+        carried = [w for w in words if w in previous_words]
+        assert carried == previous_words[len(previous_words) - len(carried):]
+        assert 0 < len(" ".join(carried)) + 1 <= 20
+        assert len(carried) < len(words)
+    assert chunks[-1]["text"].split()[-1] == "w199"
+
+
+@pytest.mark.parametrize("chunk_overlap", [50, 200])
+def test_chunk_text_overlap_not_below_size(chunk_overlap):
+    """Test an overlap of at least chunk_size still advances instead of re-spanning the text"""
+    chunker = DocumentChunker(chunk_size=50, chunk_overlap=chunk_overlap)
+    text = _words(200)
+    chunks = chunker.chunk_text(text)
+    
+    assert len(chunks) < 40
+    assert all(chunk["char_count"] <= 50 for chunk in chunks)
+    assert " ".join(chunk["text"] for chunk in chunks) == text
+
+
+def test_chunk_text_long_word():
+    """Test a word longer than chunk_size becomes its own chunk"""
+    chunker = DocumentChunker(chunk_size=10, chunk_overlap=5)
+    chunks = chunker.chunk_text("a " + "x" * 30 + " b")
+    
+    assert [chunk["text"] for chunk in chunks] == ["a", "x" * 30, "b"]
+
+
+def test_chunk_spans_match_chunk_text():
+    """Test chunk_spans gives the word ranges chunk_text joins"""
+    chunker = DocumentChunker(chunk_size=40, chunk_overlap=15)
+    text = _words(120)
+    words, spans = chunker.chunk_spans(text)
+    
+    assert [" ".join(words[a:b]) for a, b in spans.tolist()] == [c["text"] for c in chunker.chunk_text(text)]
+
+
+def test_chunk_with_pages_stream():
+    """Test streamed page chunking tags chunks with their page"""
+    chunker = DocumentChunker(chunk_size=30, chunk_overlap=0)
+    chunks = list(chunker.chunk_with_pages_stream([(1, _words(20)), (2, "last page")]))
+    
+    assert {chunk["page"] for chunk in chunks} == {1, 2}
+    assert chunks[-1] == {"text": "last page", "char_count": 9, "word_count": 2, "chunk_index": 0, "page": 2}
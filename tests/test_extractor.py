@@ -0,0 +1,76 @@
+"""
+Tests for Extractor Agent
+"""
+
+import pytest
+
+pytest.importorskip("spacy")
+pytest.importorskip("dateparser")
+
+from documind.agents.extractor import ExtractorAgent
+
+
+@pytest.fixture(scope="module")
+def extractor():
+    return ExtractorAgent()
+
+
+def test_extract_metrics_keeps_overlapping_matches(extractor):
+    """Test each metric pattern reports its own matches, including ones inside other metrics"""
+    text = "Price rose to $1.50, a 12.5% gain, on 3 million units."
+    metrics = [(m["value"], m["type"], m["position"]) for m in extractor.extract_metrics(text)]
+    
+    assert metrics == [
+        ("$1.50", "currency", 14),
+        ("1.50", "decimal", 15),
+        ("12.5%", "percentage", 23),
+        ("12.5", "decimal", 23),
+        ("3 million", "large_number", 38),
+    ]
+
+
+def test_extract_metrics_large_number_suffix(extractor):
+    """Test large-number suffixes match case-insensitively, as the per-pattern scan always did"""
+    values = [m["value"] for m in extractor.extract_metrics("Shipped 10k units and 5 more")]
+    
+    assert values == ["10k", "5 m"]
+
+
+def test_extract_dates(extractor):
+    """Test numeric and written dates are found and parsed in position order"""
+    text = "Signed 03/15/2024, reviewed March 20, 2024 and closed 1 April 2024."
+    dates = [(d["date_string"], d["parsed_date"][:10]) for d in extractor.extract_dates(text)]
+    
+    assert dates == [
+        ("03/15/2024", "2024-03-15"),
+        ("March 20, 2024", "2024-03-20"),
+        ("1 April 2024", "2024-04-01"),
+    ]
+
+
+def test_extract_tasks_due_date_and_duplicates(extractor):
+    """Test tasks pick up due dates and repeated task text is reported once"""
+    text = "Team must file the report by 04/30/2024.\nTeam must file the report by 04/30/2024."
+    tasks = extractor.extract_tasks(text)
+    
+    assert [t["task_text"] for t in tasks] == [
+        "must file the report by 04/30/2024.",
+        "by 04/30/2024.",
+    ]
+    assert [t["due_date"] for t in tasks] == ["04/30/2024", "04/30/2024"]
+
+
+def test_scan_all_matches_per_pattern_finditer(extractor):
+    """Test the fused scan finds exactly what a separate finditer per pattern finds"""
+    from documind.agents.extractor import _SCAN_PATTERNS
+    
+    text = "By 12/05/2024 the $2,000.00 budget (up 7.5% to 1,000 K) must be approved; todo: 5 March 2024."
+    scan = extractor._scan_all(text)
+    found = sorted(span for bucket in scan.values() for span in bucket)
+    expected = sorted(
+        (name, match.start(), match.end())
+        for name, pattern, _ in _SCAN_PATTERNS
+        for match in pattern.finditer(text)
+    )
+    
+    assert found == expected
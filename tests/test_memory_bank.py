@@ -0,0 +1,72 @@
+"""
+Tests for Memory Bank
+"""
+
+from datetime import datetime, timedelta
+from documind.memory.memory_bank import MemoryBank
+
+
+def test_log_replays_after_restart(tmp_path):
+    """Test stored and deleted documents survive a reload through the change log"""
+    bank = MemoryBank(storage_path=str(tmp_path))
+    bank.store_insights("doc1", {"metrics": ["$1.5M revenue"]}, {"title": "Report"})
+    bank.store_insights("doc2", {"metrics": []})
+    bank.delete_document("doc2")
+    
+    reloaded = MemoryBank(storage_path=str(tmp_path))
+    assert reloaded.get_all_documents() == ["doc1"]
+    assert reloaded.retrieve_insights("doc1")["insights"] == {"metrics": ["$1.5M revenue"]}
+    assert reloaded.retrieve_insights("doc1")["metadata"] == {"title": "Report"}
+
+
+def test_log_folds_into_snapshot(tmp_path):
+    """Test the log is folded into the snapshot once it reaches max_log_entries"""
+    bank = MemoryBank(storage_path=str(tmp_path), max_log_entries=3)
+    for i in range(3):
+        bank.store_insights(f"doc{i}", {"value": i})
+    
+    assert (tmp_path / "memory.jsonl").read_bytes() == b""
+    assert MemoryBank(storage_path=str(tmp_path)).get_all_documents() == ["doc0", "doc1", "doc2"]
+
+
+def test_unchanged_insights_keep_updated_at_after_restart(tmp_path):
+    """Test re-ingesting identical insights refreshes updated_at durably"""
+    bank = MemoryBank(storage_path=str(tmp_path))
+    bank.store_insights("doc1", {"value": 1})
+    old = (datetime.now() - timedelta(days=200)).isoformat()
+    bank.memory["doc1"]["updated_at"] = old
+    bank._save_memory()
+    
+    bank.store_insights("doc1", {"value": 1})
+    reloaded = MemoryBank(storage_path=str(tmp_path))
+    assert reloaded.retrieve_insights("doc1")["updated_at"] > old
+    
+    reloaded.compact_memory(max_age_days=90)
+    assert reloaded.get_all_documents() == ["doc1"]
+
+
+def test_compact_memory_removes_old_entries(tmp_path):
+    """Test compaction drops stale entries and keeps fresh or undated ones"""
+    bank = MemoryBank(storage_path=str(tmp_path))
+    bank.store_insights("old", {"value": 1})
+    bank.store_insights("fresh", {"value": 2})
+    bank.memory["old"]["updated_at"] = (datetime.now() - timedelta(days=100)).isoformat()
+    bank.memory["undated"] = {"insights": {}, "metadata": {}}
+    
+    bank.compact_memory(max_age_days=90)
+    assert sorted(bank.get_all_documents()) == ["fresh", "undated"]
+    assert sorted(MemoryBank(storage_path=str(tmp_path)).get_all_documents()) == ["fresh", "undated"]
+
+
+def test_search_insights_counts_and_updates(tmp_path):
+    """Test search ranks by match count and sees updated insights"""
+    bank = MemoryBank(storage_path=str(tmp_path))
+    bank.store_insights("doc1", {"text": "Revenue grew; revenue targets met"})
+    bank.store_insights("doc2", {"text": "Revenue flat"})
+    
+    results = bank.search_insights("REVENUE")
+    assert [(r["document_id"], r["relevance"]) for r in results] == [("doc1", 2), ("doc2", 1)]
+    
+    bank.store_insights("doc2", {"text": "Costs down"})
+    assert [r["document_id"] for r in bank.search_insights("revenue")] == ["doc1"]
+    assert bank.search_insights("missing") == []
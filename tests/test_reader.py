@@ -23,5 +23,32 @@ def test_detect_source_type():
     assert reader._detect_source_type("document.txt") == "text"
 
 
+def test_detect_source_type_case_and_fallback():
+    """Test source type detection ignores case and defaults to text"""
+    reader = ReaderAgent(ocr_enabled=False)
+    
+    assert reader._detect_source_type("HTTPS://EXAMPLE.COM/report.pdf") == "url"
+    assert reader._detect_source_type("Reports/Q3.PDF") == "pdf"
+    assert reader._detect_source_type("notes.md") == "text"
+    assert reader._detect_source_type("archive.tar.gz") == "text"
+    assert reader._detect_source_type("README") == "text"
+
+
+
+def test_read_documents_batch(tmp_path):
+    """Test batch reading keeps order and rejects unknown types before reading"""
+    reader = ReaderAgent(ocr_enabled=False)
+    first = tmp_path / "first.txt"
+    second = tmp_path / "second.md"
+    first.write_text("First document text.")
+    second.write_text("Second document text.")
+    
+    documents = reader.read_documents([str(first), str(second)])
+    assert [doc["text"] for doc in documents] == ["First document text.", "Second document text."]
+    
+    with pytest.raises(ValueError):
+        reader.read_documents([str(first)], source_types=["docx"])
+
+
 # Note: Full integration tests would require actual document files
 
@@ -2,8 +2,17 @@
 DocuMind Web Application - Flask Backend
 """
 
+import io
 import os
+import re
+import shutil
+import gzip
+import hashlib
+import mmap
 import uuid
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 from flask import Flask, request, jsonify, render_template, send_from_directory
 from flask_cors import CORS
 from werkzeug.utils import secure_filename
@@ -11,6 +20,16 @@ import json
 from pathlib import Path
 from loguru import logger
 
+try:
+    import orjson
+except ImportError:  # Optional: falls back to the stdlib json module
+    orjson = None
+
+try:
+    import zstandard
+except ImportError:  # Optional: saved results are gzip-compressed instead
+    zstandard = None
+
 # Import DocuMind
 import sys
 # Add parent directory to path to import documind
@@ -24,8 +43,12 @@ CORS(app)
 
 # Configuration
 UPLOAD_FOLDER = 'uploads'
-ALLOWED_EXTENSIONS = {'pdf', 'txt', 'md', 'text'}
+ALLOWED_EXTENSIONS = frozenset({'pdf', 'txt', 'md', 'text'})
 MAX_FILE_SIZE = 50 * 1024 * 1024  # 50MB
+UPLOAD_CHUNK_SIZE = 1 << 20  # 1MB copy chunks when saving uploads
+
+# Task lists arrive as "extract,summarize", "extract, summarize" or space-separated
+TASKS_SEPARATOR_RE = re.compile(r'[,\s]+')
 
 app.config['UPLOAD_FOLDER'] = UPLOAD_FOLDER
 app.config['MAX_CONTENT_LENGTH'] = MAX_FILE_SIZE
@@ -33,24 +56,436 @@ app.config['MAX_CONTENT_LENGTH'] = MAX_FILE_SIZE
 # Create upload folder
 Path(UPLOAD_FOLDER).mkdir(exist_ok=True)
 
+# Uploads are indexed by a hash of their content and tasks; each index file holds
+# the ID of the document already processed from them, so a repeat upload is
+# answered from its saved result without running the pipeline again
+DEDUP_FOLDER = os.path.join(UPLOAD_FOLDER, 'by_hash')
+Path(DEDUP_FOLDER).mkdir(exist_ok=True)
+
 # Initialize DocuMind
 documind = None
 
+# Background jobs: POST /api/process and /api/process-url with "async" set return a
+# job ID at once and the pipeline runs here. Job status lives in a small JSON file
+# next to the results, so any Gunicorn worker can answer /api/status.
+JOB_WORKERS = int(os.getenv('DOCUMIND_JOB_WORKERS', '1'))
+job_executor = ThreadPoolExecutor(max_workers=JOB_WORKERS, thread_name_prefix='documind-job')
+# DocuMind keeps the current document on the instance, so pipeline runs take turns
+documind_lock = threading.Lock()
+
+# Q&A state (document and its vector index) of recently used documents, so
+# switching back to one does not set its Q&A up again; guarded by documind_lock
+QA_STATE_CACHE_SIZE = int(os.getenv('DOCUMIND_QA_STATE_CACHE_SIZE', '8'))
+qa_states = OrderedDict()
+
+# Recent answers by (document ID, normalized question), so a repeated question
+# skips retrieval and answer generation
+QA_CACHE_SIZE = int(os.getenv('DOCUMIND_QA_CACHE_SIZE', '4096'))
+qa_cache = OrderedDict()
+qa_cache_lock = threading.Lock()
+
+# Saved results are parsed once per worker and kept for the next /api/qa or
+# /api/extractions call; with REDIS_URL set they are also shared through Redis
+# so a worker that did not process the document skips the disk read
+RESULT_CACHE_SIZE = int(os.getenv('DOCUMIND_RESULT_CACHE_SIZE', '8'))
+RESULT_TTL_SECONDS = int(os.getenv('DOCUMIND_RESULT_TTL', '3600'))
+result_cache = OrderedDict()
+result_cache_lock = threading.Lock()
+redis_client = None
+
+# Saved results are compressed, with zstd when installed and gzip otherwise;
+# reads recognize either, and uncompressed results from older versions, by their
+# leading magic bytes
+RESULT_SUFFIX = '.json.zst' if zstandard is not None else '.json.gz'
+RESULT_SUFFIXES = ('.json.zst', '.json.gz', '.json')
+ZSTD_MAGIC = b'\x28\xb5\x2f\xfd'
+GZIP_MAGIC = b'\x1f\x8b'
+
+# Each worker runs this synthetic page through the agents once at boot, so the
+# first real request does not pay for lazy model set-up and first-call overhead
+WARMUP_ENABLED = os.getenv('DOCUMIND_WARMUP', '1') == '1'
+WARMUP_TEXT = (
+    "Quarterly Operations Report\n\n"
+    "Acme Corporation closed the third quarter on September 30, 2024 with revenue of "
+    "$12.4 million, up 18% from the previous quarter. Operating costs fell to $7.9 million "
+    "after the Berlin warehouse was consolidated into the Chicago site. Customer retention "
+    "held at 94.5%, and the support team resolved 3,200 tickets with a median response "
+    "time of 2 hours.\n\n"
+    "Action items: Jane Smith must finalize the vendor contract by November 15, 2024. "
+    "The finance team should review the hiring budget before the board meeting on "
+    "December 3. Marketing will launch the spring campaign in London next year."
+)
+WARMUP_QUESTION = 'What was the revenue in the third quarter?'
+
+def init_redis():
+    """Connect to Redis if REDIS_URL is set and the redis package is installed"""
+    global redis_client
+    redis_url = os.getenv('REDIS_URL')
+    if not redis_url:
+        return
+    try:
+        import redis
+        redis_client = redis.Redis.from_url(redis_url)
+        redis_client.ping()
+        logger.info("Caching results in Redis")
+    except Exception as e:
+        logger.warning(f"Redis unavailable ({e}); results are read from disk")
+        redis_client = None
+
 def init_documind():
     """Initialize DocuMind with FREE models (no API key required!)"""
     global documind
     # Use FREE models by default - no API key needed!
     documind = DocuMind(
         use_free_models=True,  # Use FREE Hugging Face models
-        ocr_enabled=False,  # OCR disabled by default (optional)
+        # OCR disabled by default (optional); DOCUMIND_OCR=1 turns it on
+        ocr_enabled=os.getenv('DOCUMIND_OCR', '0') == '1',
         memory_enabled=True,
-        evaluation_enabled=True
+        evaluation_enabled=True,
+        # Larger batches keep a GPU busy; smaller ones bound peak memory on small instances
+        embedding_batch_size=int(os.getenv('DOCUMIND_EMBEDDING_BATCH_SIZE', '64')),
+        # OCR threads per document; tesseract does the work outside the GIL
+        ocr_workers=int(os.getenv('DOCUMIND_OCR_WORKERS', str(os.cpu_count() or 1)))
     )
     logger.info("DocuMind initialized with FREE models - No API key required!")
 
+def load_models():
+    """Load the agents' models now rather than on the first request that needs them"""
+    # The Q&A agent is left to each worker: it places its embedding model on CUDA
+    # when a GPU is present, and a CUDA context created before the fork is unusable
+    # in the workers. The summarizer always runs on CPU.
+    for agent in ('reader', 'extractor', 'analyzer'):
+        try:
+            getattr(documind, agent)
+        except Exception as e:
+            logger.warning(f"Could not preload the {agent} agent ({e}); it loads on first use")
+
+def warm_up():
+    """
+    Run WARMUP_TEXT through the models without touching memory, caches or the current document
+    
+    The summarizer and Q&A agents used here are throwaway instances with no summary
+    cache and an in-memory vector index that is dropped afterwards, but they share the
+    process-wide loaded models with documind, so this runs under documind_lock.
+    """
+    path = os.path.join(app.config['UPLOAD_FOLDER'], f"warmup_{os.getpid()}.txt")
+    try:
+        from documind.agents.analyzer import AnalyzerAgent
+        from documind.agents.qa_agent import QAAgent
+        
+        with open(path, 'w', encoding='utf-8') as f:
+            f.write(WARMUP_TEXT)
+        with documind_lock:
+            document = documind.reader.read_document(path, source_type='text')
+            documind.extractor.extract_all(document)
+            AnalyzerAgent(cache_path=None).generate_summaries(document)
+            qa = QAAgent(vector_backend='memory', embedding_batch_size=documind.embedding_batch_size)
+            qa.setup_document(document)
+            qa.answer(WARMUP_QUESTION)
+        logger.info("DocuMind warmed up")
+    except Exception as e:
+        logger.warning(f"Warm-up failed ({e}); the first request loads what it needs")
+    finally:
+        try:
+            os.remove(path)
+        except OSError:
+            pass
+
+def schedule_warmup():
+    """Warm up on a background thread of its own, if enabled, rather than in the job queue"""
+    if WARMUP_ENABLED:
+        threading.Thread(target=warm_up, name='documind-warmup', daemon=True).start()
+
+def file_extension(filename):
+    """Lowercased extension of a filename, or '' if it has none"""
+    _, dot, ext = filename.rpartition('.')
+    return ext.lower() if dot else ''
+
+def parse_tasks(value):
+    """Split a comma- or space-separated task list, dropping blanks"""
+    return [task for task in TASKS_SEPARATOR_RE.split(value) if task]
+
 def allowed_file(filename):
     """Check if file extension is allowed"""
-    return '.' in filename and filename.rsplit('.', 1)[1].lower() in ALLOWED_EXTENSIONS
+    return file_extension(filename) in ALLOWED_EXTENSIONS
+
+def wants_async(value):
+    """Check if a request flag asks for background processing"""
+    return str(value).lower() in ('1', 'true', 'yes')
+
+def save_upload(file, filepath):
+    """Write an uploaded file to disk in UPLOAD_CHUNK_SIZE chunks"""
+    stream = file.stream
+    # Werkzeug spools large uploads to a temporary file; copy those in the
+    # kernel with sendfile instead of through Python buffers. Small uploads
+    # still in memory are read from the SpooledTemporaryFile's buffer without
+    # forcing it to roll over to disk.
+    try:
+        src_fd = getattr(stream, '_file', stream).fileno()
+    except (AttributeError, OSError, io.UnsupportedOperation):
+        src_fd = None
+    
+    if src_fd is not None and hasattr(os, 'sendfile'):
+        stream.seek(0)
+        dst_fd = os.open(filepath, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644)
+        try:
+            offset = 0
+            while True:
+                sent = os.sendfile(dst_fd, src_fd, offset, UPLOAD_CHUNK_SIZE)
+                if sent == 0:
+                    return
+                offset += sent
+        except OSError:
+            # Filesystems without file-to-file sendfile: fall through and copy
+            pass
+        finally:
+            os.close(dst_fd)
+    
+    stream.seek(0)
+    with open(filepath, 'wb') as dst:
+        shutil.copyfileobj(stream, dst, UPLOAD_CHUNK_SIZE)
+
+def upload_key(filepath, tasks):
+    """BLAKE2b digest of a saved upload's content and the requested tasks"""
+    digest = hashlib.blake2b(digest_size=20)
+    buffer = bytearray(UPLOAD_CHUNK_SIZE)
+    view = memoryview(buffer)
+    with open(filepath, 'rb', buffering=0) as f:
+        while True:
+            n = f.readinto(buffer)
+            if not n:
+                break
+            digest.update(view[:n])
+    digest.update(b'\0' + ','.join(sorted(set(tasks))).encode('utf-8'))
+    return digest.hexdigest()
+
+def find_duplicate(content_key):
+    """Saved result of an earlier upload with the same content key, or None"""
+    try:
+        with open(os.path.join(DEDUP_FOLDER, content_key), 'r', encoding='utf-8') as f:
+            document_id = f.read().strip()
+    except FileNotFoundError:
+        return None
+    return load_result(document_id)
+
+def remember_upload(content_key, document_id):
+    """Point a content key at the document processed from it"""
+    path = os.path.join(DEDUP_FOLDER, content_key)
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        f.write(document_id)
+    os.replace(tmp_path, path)
+
+def summarize_result(result):
+    """Build the API response for a processed document"""
+    extractions = result.get('extractions', {})
+    return {
+        'document_id': result['document_id'],
+        'metadata': result['document']['metadata'],
+        'extractions': {
+            'tables_count': len(extractions.get('tables', [])),
+            'metrics_count': len(extractions.get('metrics', [])),
+            'dates_count': len(extractions.get('dates', [])),
+            'tasks_count': len(extractions.get('tasks', [])),
+            'entities_count': len(extractions.get('entities', {}).get('all', [])) if isinstance(extractions.get('entities'), dict) else 0
+        },
+        'summaries': result.get('summaries', {}),
+        'has_qa': result.get('qa') is not None
+    }
+
+def run_pipeline(source, tasks, document_id=None, save_result=False, content_key=None):
+    """Process a document and return the API response, saving the full result if asked"""
+    if not documind:
+        init_documind()
+    
+    with documind_lock:
+        result = documind.process_document(
+            source=source,
+            tasks=tasks,
+            document_id=document_id,
+            store_in_memory=True
+        )
+        if 'qa' in tasks:
+            remember_qa_state(result['document_id'], result['document'])
+    
+    qa_cache_forget(result['document_id'])
+    
+    if save_result:
+        # Store full result on disk, and in Redis when configured
+        # Serialized and compressed into one buffer and written with a single call
+        payload = compress_result(dumps_json(result))
+        # Replaced atomically so a concurrent read never sees a partial stream
+        path = result_path(result['document_id'])
+        tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(tmp_path, 'wb') as f:
+            f.write(payload)
+        os.replace(tmp_path, path)
+        if redis_client is not None:
+            try:
+                redis_client.setex(f"documind:result:{result['document_id']}", RESULT_TTL_SECONDS, payload)
+            except Exception as e:
+                logger.warning(f"Could not cache result in Redis: {e}")
+        with result_cache_lock:
+            result_cache.pop(result['document_id'], None)
+        if content_key is not None:
+            remember_upload(content_key, result['document_id'])
+    
+    return summarize_result(result)
+
+def dumps_json(obj):
+    """Serialize to compact UTF-8 JSON bytes, with orjson when installed"""
+    if orjson is not None:
+        return orjson.dumps(obj, default=str, option=orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY)
+    return json.dumps(obj, default=str, ensure_ascii=False).encode('utf-8')
+
+def loads_json(data):
+    """Parse JSON from bytes or a buffer, with orjson when installed"""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(bytes(data))
+
+def compress_result(payload):
+    """Compress serialized result bytes with zstd when installed, otherwise gzip"""
+    if zstandard is not None:
+        return zstandard.ZstdCompressor(level=3).compress(payload)
+    return gzip.compress(payload, compresslevel=6)
+
+def decompress_result(data):
+    """Undo compress_result on bytes or a buffer; uncompressed JSON is returned as-is"""
+    head = bytes(data[:4])
+    if head == ZSTD_MAGIC:
+        if zstandard is None:
+            raise RuntimeError('zstandard is required to read this saved result')
+        return zstandard.ZstdDecompressor().decompress(data)
+    if head[:2] == GZIP_MAGIC:
+        return gzip.decompress(data)
+    return data
+
+def result_path(document_id, suffix=RESULT_SUFFIX):
+    """Path of a document's saved full result"""
+    return os.path.join(app.config['UPLOAD_FOLDER'], f"{document_id}_result{suffix}")
+
+def load_result(document_id):
+    """Get a document's saved full result, or None if there is none"""
+    with result_cache_lock:
+        result = result_cache.get(document_id)
+        if result is not None:
+            result_cache.move_to_end(document_id)
+            return result
+    
+    result = read_result(document_id)
+    if result is not None:
+        with result_cache_lock:
+            result_cache[document_id] = result
+            while len(result_cache) > RESULT_CACHE_SIZE:
+                result_cache.popitem(last=False)
+    return result
+
+def read_result(document_id):
+    """Read a document's saved full result from Redis or disk, or None if there is none"""
+    if redis_client is not None:
+        try:
+            payload = redis_client.get(f"documind:result:{document_id}")
+            if payload is not None:
+                return loads_json(decompress_result(payload))
+        except Exception as e:
+            logger.warning(f"Could not read result from Redis: {e}")
+    
+    for suffix in RESULT_SUFFIXES:
+        try:
+            with open(result_path(document_id, suffix), 'rb') as f:
+                # Decompressed (or parsed) straight from the page cache instead of
+                # copying the file into a bytes object first
+                with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm, memoryview(mm) as view:
+                    return loads_json(decompress_result(view))
+        except FileNotFoundError:
+            continue
+    return None
+
+def remember_qa_state(document_id, document):
+    """Keep the Q&A agent's current index for a document (caller holds documind_lock)"""
+    qa_states[document_id] = (document, documind.qa.collection)
+    qa_states.move_to_end(document_id)
+    while len(qa_states) > QA_STATE_CACHE_SIZE:
+        # Dropping the last reference frees the evicted index
+        qa_states.popitem(last=False)
+
+def activate_document(document_id):
+    """Make a document current for Q&A, reusing its cached index (caller holds documind_lock)"""
+    if document_id == documind.current_document_id and documind.current_document:
+        return
+    
+    state = qa_states.get(document_id)
+    if state is not None:
+        qa_states.move_to_end(document_id)
+        document, collection = state
+        documind.qa.collection = collection
+    else:
+        result = load_result(document_id)
+        if result is None:
+            return
+        document = result['document']
+        documind.qa.setup_document(document)
+        remember_qa_state(document_id, document)
+    
+    documind.current_document = document
+    documind.current_document_id = document_id
+
+def qa_cache_key(document_id, question):
+    """Cache key for a question, ignoring case and spacing differences"""
+    return document_id, ' '.join(question.lower().split())
+
+def qa_cache_get(key):
+    """Look up a cached answer, marking it recently used"""
+    with qa_cache_lock:
+        answer = qa_cache.get(key)
+        if answer is not None:
+            qa_cache.move_to_end(key)
+        return answer
+
+def qa_cache_put(key, answer):
+    """Cache an answer, evicting the least recently used beyond QA_CACHE_SIZE"""
+    with qa_cache_lock:
+        qa_cache[key] = answer
+        qa_cache.move_to_end(key)
+        while len(qa_cache) > QA_CACHE_SIZE:
+            qa_cache.popitem(last=False)
+
+def qa_cache_forget(document_id):
+    """Drop cached answers for a document that was processed again"""
+    with qa_cache_lock:
+        for key in [key for key in qa_cache if key[0] == document_id]:
+            del qa_cache[key]
+
+def status_path(job_id):
+    """Path of a background job's status file"""
+    return os.path.join(app.config['UPLOAD_FOLDER'], f"{job_id}_status.json")
+
+def write_status(job_id, status):
+    """Atomically replace a background job's status file"""
+    path = status_path(job_id)
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    with open(tmp_path, 'wb') as f:
+        f.write(dumps_json(status))
+    os.replace(tmp_path, path)
+
+def run_job(job_id, source, tasks, document_id, save_result, content_key):
+    """Run a pipeline in the background and record its outcome"""
+    write_status(job_id, {'job_id': job_id, 'status': 'running'})
+    try:
+        response_data = run_pipeline(
+            source, tasks, document_id=document_id, save_result=save_result, content_key=content_key
+        )
+        write_status(job_id, {'job_id': job_id, 'status': 'done', 'result': response_data})
+    except Exception as e:
+        logger.error(f"Error in job {job_id}: {e}")
+        write_status(job_id, {'job_id': job_id, 'status': 'error', 'error': str(e)})
+
+def submit_job(job_id, source, tasks, document_id=None, save_result=False, content_key=None):
+    """Queue a pipeline run and return the 202 response with its job ID"""
+    write_status(job_id, {'job_id': job_id, 'status': 'pending'})
+    job_executor.submit(run_job, job_id, source, tasks, document_id, save_result, content_key)
+    return jsonify({'job_id': job_id, 'status': 'pending'}), 202
 
 @app.route('/')
 def index():
@@ -79,53 +514,35 @@ def process_document():
         if file.filename == '':
             return jsonify({'error': 'No file selected'}), 400
         
-        if not allowed_file(file.filename):
+        file_ext = file_extension(file.filename)
+        if file_ext not in ALLOWED_EXTENSIONS:
             return jsonify({'error': 'File type not allowed. Use PDF or TXT files.'}), 400
         
         # Get tasks from request
-        tasks = request.form.get('tasks', 'extract,summarize').split(',')
+        tasks = parse_tasks(request.form.get('tasks', 'extract,summarize'))
         
         # Save file
         filename = secure_filename(file.filename)
         file_id = str(uuid.uuid4())
-        file_ext = filename.rsplit('.', 1)[1].lower()
         saved_filename = f"{file_id}.{file_ext}"
         filepath = os.path.join(app.config['UPLOAD_FOLDER'], saved_filename)
-        file.save(filepath)
-        
-        logger.info(f"Processing file: {filename} (ID: {file_id})")
+        save_upload(file, filepath)
         
-        # Process document
-        if not documind:
-            init_documind()
+        # Identical file and tasks already processed: answer from the saved result
+        content_key = upload_key(filepath, tasks)
+        previous = find_duplicate(content_key)
+        if previous is not None:
+            os.remove(filepath)
+            logger.info(f"Reusing result of {previous['document_id']} for identical upload {filename}")
+            return jsonify(summarize_result(previous))
         
-        result = documind.process_document(
-            source=filepath,
-            tasks=tasks,
-            document_id=file_id,
-            store_in_memory=True
-        )
+        logger.info(f"Processing file: {filename} (ID: {file_id})")
         
-        # Prepare response
-        response_data = {
-            'document_id': result['document_id'],
-            'metadata': result['document']['metadata'],
-            'extractions': {
-                'tables_count': len(result.get('extractions', {}).get('tables', [])),
-                'metrics_count': len(result.get('extractions', {}).get('metrics', [])),
-                'dates_count': len(result.get('extractions', {}).get('dates', [])),
-                'tasks_count': len(result.get('extractions', {}).get('tasks', [])),
-                'entities_count': len(result.get('extractions', {}).get('entities', {}).get('all', [])) if isinstance(result.get('extractions', {}).get('entities'), dict) else 0
-            },
-            'summaries': result.get('summaries', {}),
-            'has_qa': result.get('qa') is not None
-        }
-        
-        # Store full result in session (in production, use Redis or database)
-        result_file = os.path.join(app.config['UPLOAD_FOLDER'], f"{file_id}_result.json")
-        with open(result_file, 'w', encoding='utf-8') as f:
-            json.dump(result, f, indent=2, default=str)
+        if wants_async(request.form.get('async', request.args.get('async'))):
+            return submit_job(file_id, filepath, tasks, document_id=file_id, save_result=True, content_key=content_key)
         
+        # Process document
+        response_data = run_pipeline(filepath, tasks, document_id=file_id, save_result=True, content_key=content_key)
         return jsonify(response_data)
         
     except Exception as e:
@@ -143,29 +560,10 @@ def process_url():
         if not url:
             return jsonify({'error': 'URL not provided'}), 400
         
-        if not documind:
-            init_documind()
-        
-        result = documind.process_document(
-            source=url,
-            tasks=tasks,
-            store_in_memory=True
-        )
-        
-        response_data = {
-            'document_id': result['document_id'],
-            'metadata': result['document']['metadata'],
-            'extractions': {
-                'tables_count': len(result.get('extractions', {}).get('tables', [])),
-                'metrics_count': len(result.get('extractions', {}).get('metrics', [])),
-                'dates_count': len(result.get('extractions', {}).get('dates', [])),
-                'tasks_count': len(result.get('extractions', {}).get('tasks', [])),
-                'entities_count': len(result.get('extractions', {}).get('entities', {}).get('all', [])) if isinstance(result.get('extractions', {}).get('entities'), dict) else 0
-            },
-            'summaries': result.get('summaries', {}),
-            'has_qa': result.get('qa') is not None
-        }
+        if wants_async(data.get('async', request.args.get('async'))):
+            return submit_job(str(uuid.uuid4()), url, tasks)
         
+        response_data = run_pipeline(url, tasks)
         return jsonify(response_data)
         
     except Exception as e:
@@ -183,20 +581,25 @@ def answer_question():
         if not question:
             return jsonify({'error': 'Question not provided'}), 400
         
+        cache_key = qa_cache_key(document_id, question) if document_id else None
+        if cache_key is not None:
+            answer = qa_cache_get(cache_key)
+            if answer is not None:
+                return jsonify(answer)
+        
         if not documind:
             init_documind()
         
-        # Load document result if needed
-        result_file = os.path.join(app.config['UPLOAD_FOLDER'], f"{document_id}_result.json")
-        if os.path.exists(result_file):
-            with open(result_file, 'r', encoding='utf-8') as f:
-                result = json.load(f)
-            # Re-setup Q&A if needed
-            if not documind.current_document:
-                documind.current_document = result['document']
-                documind.qa.setup_document(result['document'])
+        with documind_lock:
+            # Switch to the asked-about document, setting up its Q&A only on first use
+            if document_id:
+                activate_document(document_id)
+            
+            answer = documind.answer_question(question, return_citations=True)
+            answered_document_id = documind.current_document_id if documind.current_document else None
         
-        answer = documind.answer_question(question, return_citations=True)
+        if cache_key is not None and answered_document_id == document_id:
+            qa_cache_put(cache_key, answer)
         
         return jsonify(answer)
         
@@ -204,17 +607,31 @@ def answer_question():
         logger.error(f"Error answering question: {e}")
         return jsonify({'error': str(e)}), 500
 
+@app.route('/api/status/<job_id>', methods=['GET'])
+def get_status(job_id):
+    """Get the status of a background processing job, with its result once done"""
+    try:
+        status_file = status_path(secure_filename(job_id))
+        if not os.path.exists(status_file):
+            return jsonify({'error': 'Job not found'}), 404
+        
+        with open(status_file, 'r', encoding='utf-8') as f:
+            status = json.load(f)
+        
+        return jsonify(status)
+        
+    except Exception as e:
+        logger.error(f"Error getting job status: {e}")
+        return jsonify({'error': str(e)}), 500
+
 @app.route('/api/extractions/<document_id>', methods=['GET'])
 def get_extractions(document_id):
     """Get detailed extractions for a document"""
     try:
-        result_file = os.path.join(app.config['UPLOAD_FOLDER'], f"{document_id}_result.json")
-        if not os.path.exists(result_file):
+        result = load_result(document_id)
+        if result is None:
             return jsonify({'error': 'Document not found'}), 404
         
-        with open(result_file, 'r', encoding='utf-8') as f:
-            result = json.load(f)
-        
         return jsonify(result.get('extractions', {}))
         
     except Exception as e:
@@ -222,12 +639,20 @@ def get_extractions(document_id):
         return jsonify({'error': str(e)}), 500
 
 if __name__ == '__main__':
+    init_redis()
     init_documind()
+    schedule_warmup()
     port = int(os.getenv('PORT', 5000))
     debug = os.getenv('FLASK_ENV') == 'development'
     app.run(host='0.0.0.0', port=port, debug=debug)
 
-# For Gunicorn
+# For Gunicorn. With preload_app (gunicorn_config.py, or --preload) this happens
+# once in the master: the models are loaded before the fork and every worker
+# shares their weights copy-on-write. Nothing here starts a thread or runs
+# inference, so the job executor, the locks and the torch thread pools are first
+# used after the fork; gunicorn_config.py starts each worker's warm-up from there.
 if __name__ != '__main__':
+    init_redis()
     init_documind()
-
+    if os.getenv('DOCUMIND_PRELOAD', '1') == '1':
+        load_models()
@@ -2,7 +2,6 @@
 Gunicorn configuration for production deployment
 """
 
-import multiprocessing
 import os
 
 # Server socket
@@ -10,12 +9,18 @@ bind = f"0.0.0.0:{os.getenv('PORT', '5000')}"
 backlog = 2048
 
 # Worker processes
-workers = multiprocessing.cpu_count() * 2 + 1
+# Each worker holds its own copy of whatever the models allocate after the fork,
+# so keep this small on small instances; raise it with WEB_CONCURRENCY
+workers = int(os.getenv('WEB_CONCURRENCY', '2'))
 worker_class = 'sync'
 worker_connections = 1000
 timeout = 30
 keepalive = 2
 
+# Load the app, and with it the models, once in the master before forking so
+# workers share the weights copy-on-write instead of each loading its own copy
+preload_app = os.getenv('DOCUMIND_PRELOAD', '1') == '1'
+
 # Logging
 accesslog = '-'
 errorlog = '-'
@@ -32,3 +37,9 @@ user = None
 group = None
 tmp_upload_dir = None
 
+
+def post_worker_init(worker):
+    """Warm up the worker's models in the background once the app is loaded"""
+    from app import schedule_warmup
+    schedule_warmup()
+
@@ -35,6 +35,7 @@ document.getElementById('uploadForm').addEventListener('submit', async (e) => {
     const checkboxes = document.querySelectorAll('#fileTab input[name="tasks"]:checked');
     const tasks = Array.from(checkboxes).map(cb => cb.value);
     formData.append('tasks', tasks.join(','));
+    formData.append('async', '1');
     
     await processDocument(formData, 'file');
 });
@@ -54,7 +55,8 @@ document.getElementById('urlForm').addEventListener('submit', async (e) => {
     
     const data = {
         url: url,
-        tasks: tasks
+        tasks: tasks,
+        async: true
     };
     
     await processDocument(data, 'url');
@@ -75,12 +77,17 @@ async function processDocument(data, type) {
             };
         
         const response = await fetch(url, options);
-        const result = await response.json();
+        let result = await response.json();
         
         if (!response.ok) {
             throw new Error(result.error || 'Processing failed');
         }
         
+        // Processing runs in the background; poll until it finishes
+        if (result.job_id) {
+            result = await waitForJob(result.job_id);
+        }
+        
         currentDocumentId = result.document_id;
         currentSummaries = result.summaries || {};
         
@@ -94,6 +101,23 @@ async function processDocument(data, type) {
     }
 }
 
+// Poll a background processing job until it is done
+async function waitForJob(jobId) {
+    while (true) {
+        await new Promise(resolve => setTimeout(resolve, 1000));
+        
+        const response = await fetch(`/api/status/${jobId}`);
+        const status = await response.json();
+        
+        if (!response.ok || status.status === 'error') {
+            throw new Error(status.error || 'Processing failed');
+        }
+        if (status.status === 'done') {
+            return status.result;
+        }
+    }
+}
+
 // Display results
 function displayResults(result) {
     // Hide upload section, show results